@@ -4,6 +4,7 @@ from typing import List
 from app.models.room import Room, RoomCreateRequest, RoomResponse, PlayerInRoom, RoomSettings
 from app.models.token import TokenData
 from app.crud import crud_room
+from app.core.json_encoder import json_fragment
 from app.core.security import get_current_guest_from_token
 from app.core.utils import generate_unique_room_code
 from app.websocket.manager import websocket_manager
@@ -63,8 +64,10 @@ async def create_room(
 
     response = RoomResponse.from_orm(persisted_room)
 
+    # Room codes can be reused once a room is deleted, so start this one's version bookkeeping afresh.
+    websocket_manager.forget_room(persisted_room.room_id)
     # Emit a global gameStateUpdate to notify all clients of the new room
-    await websocket_manager.emit('gameStateUpdate', response.model_dump(mode='json'))
+    await websocket_manager.emit_room_state(persisted_room.room_id, persisted_room.version, json_fragment(response))
 
     return response
 
@@ -148,26 +151,27 @@ async def join_room_http(
             detail="Could not validate credentials for joining player",
         )
 
-    existing_room_data = await crud_room.get_room_by_id(room_id=room_id)
-    if not existing_room_data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
-
     player_to_add = PlayerInRoom(
         guest_id=current_guest.sub,
         nickname=current_guest.nickname,
         sid=None
     )
 
-    updated_room = await crud_room.add_player_to_room(room_id=room_id, player=player_to_add)
+    try:
+        updated_room = await crud_room.add_player_to_room(room_id=room_id, player=player_to_add)
+    except crud_room.RoomNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+    except crud_room.RoomFullError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to join room. Room is full.")
 
     if updated_room is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to join room. Room may be full or an error occurred."
+            detail="Failed to join room. An error occurred."
         )
     
     response = RoomResponse.from_orm(updated_room)
-    await websocket_manager.emit('gameStateUpdate', response.model_dump(mode='json'))
+    await websocket_manager.emit_room_state(updated_room.room_id, updated_room.version, json_fragment(response))
 
     return response
 
@@ -213,7 +217,7 @@ async def toggle_player_ready(
             )
 
         response = RoomResponse.from_orm(updated_room)
-        await websocket_manager.emit('gameStateUpdate', response.model_dump(mode='json'))
+        await websocket_manager.emit_room_state(updated_room.room_id, updated_room.version, json_fragment(response))
         
         return response
 
@@ -278,7 +282,7 @@ async def start_game(
             )
 
         response = RoomResponse.from_orm(updated_room)
-        await websocket_manager.emit('gameStateUpdate', response.model_dump(mode='json'), room=room_id)
+        await websocket_manager.emit_room_state(updated_room.room_id, updated_room.version, json_fragment(response), room=room_id)
         
         return response
 
@@ -336,7 +340,7 @@ async def restart_game(
             )
 
         response = RoomResponse.from_orm(updated_room)
-        await websocket_manager.emit('gameStateUpdate', response.model_dump(mode='json'), room=room_id)
+        await websocket_manager.emit_room_state(updated_room.room_id, updated_room.version, json_fragment(response), room=room_id)
         
         return response
 
@@ -377,7 +381,7 @@ async def leave_room(
 
         if updated_room:
             response = RoomResponse.from_orm(updated_room)
-            await websocket_manager.emit('gameStateUpdate', response.model_dump(mode='json'))
+            await websocket_manager.emit_room_state(updated_room.room_id, updated_room.version, json_fragment(response))
         
         return
 
@@ -4,6 +4,7 @@ from typing import List
 
 from app.crud import crud_room
 from app.models.room import Room
+from app.websocket.manager import websocket_manager
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +16,15 @@ async def clean_inactive_rooms():
     empty_rooms = await crud_room.get_rooms_with_no_players()
     for room in empty_rooms:
         await crud_room.delete_room(room.room_id)
-        logger.info(f"Deleted empty room: {room.room_id}")
+        websocket_manager.forget_room(room.room_id)
+        logger.info("Deleted empty room: %s", room.room_id)
 
     # Find rooms that have been inactive for more than 60 minutes
     threshold = datetime.now(timezone.utc) - timedelta(minutes=60)
     inactive_rooms = await crud_room.get_rooms_inactive_since(threshold)
     for room in inactive_rooms:
         await crud_room.delete_room(room.room_id)
-        logger.info(f"Deleted inactive room: {room.room_id} (last activity: {room.last_activity})")
+        websocket_manager.forget_room(room.room_id)
+        logger.info("Deleted inactive room: %s (last activity: %s)", room.room_id, room.last_activity)
 
     return {"deleted_empty_rooms": len(empty_rooms), "deleted_inactive_rooms": len(inactive_rooms)}
\ No newline at end of file
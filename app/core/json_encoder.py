@@ -1,8 +1,25 @@
-import json
-from datetime import datetime
-
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, o):
-        if isinstance(o, datetime):
-            return o.isoformat()
-        return super().default(o)
\ No newline at end of file
+import orjson
+from pydantic import BaseModel
+
+class OrjsonModule:
+    """
+    A `json`-module-compatible wrapper around orjson, for `python-socketio` and `python-engineio`.
+
+    orjson serializes datetimes (as ISO 8601, like `datetime.isoformat`) and dataclasses such as `Card`
+    natively, so no custom encoder is needed. Both libraries concatenate the result with a packet
+    prefix, so `dumps` returns `str`. Keyword arguments meant for `json` (e.g. `separators`) are
+    ignored because orjson output is always compact.
+    """
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def json_fragment(model: BaseModel, **dump_kwargs) -> orjson.Fragment:
+    """
+    Serializes a pydantic model to JSON once, in pydantic-core, and wraps it so `OrjsonModule`
+    embeds the bytes verbatim instead of walking a dumped dict again. Use it for payloads that are
+    emitted as-is, such as the full room state broadcast after every change.
+    """
+    return orjson.Fragment(model.__pydantic_serializer__.to_json(model, **dump_kwargs))
@@ -1,5 +1,7 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -18,6 +20,12 @@ CREDENTIALS_EXCEPTION = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
+# Recently verified tokens, keyed by a digest so raw tokens are not kept in memory.
+# Each value is (wall-clock expiry, TokenData); an entry never outlives the token's own `exp` claim.
+TOKEN_CACHE_TTL_S = 60
+TOKEN_CACHE_MAX_SIZE = 10_000
+_verified_tokens: Dict[bytes, Tuple[float, TokenData]] = {}
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a new JWT access token.
@@ -52,6 +60,7 @@ async def decode_access_token(token: str) -> TokenData:
     """
     Decodes a JWT access token and returns the contained data.
     This is a utility function for internal use.
+    A token verified within the last `TOKEN_CACHE_TTL_S` seconds is served from cache, so reconnects skip re-verification.
 
     Args:
         token: The JWT string.
@@ -62,21 +71,15 @@ async def decode_access_token(token: str) -> TokenData:
     Returns:
         TokenData: The decoded token data (sub, nickname).
     """
-    try:
-        # --- Start Enhanced Logging ---
-        current_time_utc = datetime.now(timezone.utc)
-        
-        try:
-            # Manually decode payload for logging without validation
-            import base64
-            import json
-            payload_unverified = json.loads(base64.urlsafe_b64decode(token.split('.')[1] + '==').decode())
-            exp_time = datetime.fromtimestamp(payload_unverified.get('exp', 0), tz=timezone.utc)
-            iat_time = datetime.fromtimestamp(payload_unverified.get('iat', 0), tz=timezone.utc)
-        except Exception:
-            pass
-        # --- End Enhanced Logging ---
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    cached = _verified_tokens.get(cache_key)
+    if cached is not None:
+        if cached[0] > now:
+            return cached[1]
+        del _verified_tokens[cache_key]
 
+    try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
@@ -89,10 +92,16 @@ async def decode_access_token(token: str) -> TokenData:
         if guest_id is None:
             raise CREDENTIALS_EXCEPTION
 
-        return TokenData(sub=guest_id, nickname=nickname)
+        token_data = TokenData(sub=guest_id, nickname=nickname)
     except JWTError as e:
         raise CREDENTIALS_EXCEPTION
 
+    # Dicts keep insertion order, so the first key is the oldest entry.
+    if len(_verified_tokens) >= TOKEN_CACHE_MAX_SIZE:
+        del _verified_tokens[next(iter(_verified_tokens))]
+    _verified_tokens[cache_key] = (min(now + TOKEN_CACHE_TTL_S, payload.get("exp", now)), token_data)
+    return token_data
+
 
 async def get_current_guest_from_token(token: str = Depends(oauth2_scheme)) -> TokenData:
     """
@@ -17,7 +17,7 @@ async def generate_unique_room_code(length: int = 4) -> str:
         # Check if a room with this code already exists using the CRUD function
         existing_room = await crud_room.get_room_by_id(room_id=code)
         if not existing_room:
-            logger.info(f"Generated unique room code: {code}")
+            logger.info("Generated unique room code: %s", code)
             return code
         else:
-            logger.info(f"Generated room code {code} already exists. Retrying...")
\ No newline at end of file
+            logger.info("Generated room code %s already exists. Retrying...", code)
\ No newline at end of file
@@ -1,15 +1,22 @@
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
-from app.models.room import Room, PlayerInRoom, Card, CardGameSpecificState
+from app.models.room import Room, PlayerInRoom, CardGameSpecificState
 from app.db.mongodb_utils import get_database # To get the DB instance
-import random
+from app.domain.deck import decode, shuffled_keys
 
 
 ROOM_COLLECTION = "rooms" # Name of the MongoDB collection for rooms
 
+class RoomNotFoundError(Exception):
+    """Raised by `add_player_to_room` when the room does not exist."""
+
+class RoomFullError(Exception):
+    """Raised by `add_player_to_room` when the room has no free seat."""
+
 async def get_room_collection() -> AsyncIOMotorCollection:
     """
     Retrieves the MongoDB collection for rooms.
@@ -104,14 +111,19 @@ async def add_player_to_room(room_id: str, player: PlayerInRoom) -> Optional[Roo
     """
     Adds a player to the specified room's player list.
     If the player already exists, their SID is updated.
-    If the room is full, no player is added.
+    If the room is full, no player is added; the capacity check and the add are one atomic update.
+    A join counts as room activity, so `last_activity` is stamped in the same update.
     
     Args:
         room_id (str): The ID of the room to add the player to.
         player (PlayerInRoom): The PlayerInRoom object representing the player to add.
         
     Returns:
-        Optional[Room]: The updated Room object if the player was added or updated, None otherwise.
+        Optional[Room]: The room as it is after the player was added or updated, None on an unexpected error.
+
+    Raises:
+        RoomNotFoundError: If the room does not exist.
+        RoomFullError: If the room is full.
     """
     try:
         collection = await get_room_collection()
@@ -126,53 +138,60 @@ async def add_player_to_room(room_id: str, player: PlayerInRoom) -> Optional[Roo
             {
                 "$set": {
                     "players.$.sid": player.sid,
-                    "updated_at": now
-                }
+                    "updated_at": now,
+                    "last_activity": now
+                },
+                "$inc": {"version": 1}
             },
-            return_document=True
+            return_document=ReturnDocument.AFTER
         )
 
         if updated_room_doc:
             return Room(**updated_room_doc)
 
-        # If player does not exist, check if room is full and then add them
-        room_to_join = await collection.find_one({"_id": room_id})
-        if not room_to_join:
-            return None
-        
-        room_settings = room_to_join.get("settings", {})
-        max_players = room_settings.get("max_players", 0)
-
-        if len(room_to_join.get("players", [])) >= max_players:
-            return None
-
+        # Otherwise add them. The duplicate and capacity checks are part of the update filter, so no
+        # separate read is needed and two concurrent joins cannot both take the last seat.
         updated_room_doc_after_add = await collection.find_one_and_update(
             {
                 "_id": room_id,
                 "players.guest_id": {"$ne": player.guest_id},
+                "$expr": {"$lt": [{"$size": "$players"}, "$settings.max_players"]}
             },
             {
                 "$addToSet": {"players": player.model_dump()},
-                "$set": {"updated_at": now}
+                "$set": {"updated_at": now, "last_activity": now},
+                "$inc": {"version": 1}
             },
-            return_document=True
+            return_document=ReturnDocument.AFTER
         )
 
         if updated_room_doc_after_add:
             return Room(**updated_room_doc_after_add)
-        else:
-            final_room_check = await get_room_by_id(room_id)
+
+        # Nothing matched: the room is gone or full, or a concurrent join added this player first.
+        final_room_check = await get_room_by_id(room_id)
+        if not final_room_check:
+            raise RoomNotFoundError(room_id)
+        if player.guest_id in final_room_check.guest_index:
             return final_room_check
+        raise RoomFullError(room_id)
 
+    except (RoomNotFoundError, RoomFullError):
+        raise
     except RuntimeError:
         return None
     except Exception:
         return None
 
+def _guest_id_literal(guest_id: str) -> Dict[str, str]:
+    """A guest id as a pipeline expression; `$literal` keeps an id starting with `$` from being read as a field path."""
+    return {"$literal": guest_id}
+
 async def remove_player_from_room(room_id: str, guest_id: str) -> Optional[Room]:
     """
     Removes a player from the specified room's player list.
     If the host leaves, a new host is assigned if other players remain.
+    The removal, host hand-over and activity stamp are one pipeline update, so this is a single round trip.
     
     Args:
         room_id (str): The ID of the room.
@@ -183,32 +202,30 @@ async def remove_player_from_room(room_id: str, guest_id: str) -> Optional[Room]
     """
     try:
         collection = await get_room_collection()
-        room_doc = await collection.find_one({"_id": room_id})
-
-        if not room_doc:
-            return None
-
-        room = Room(**room_doc)
-        room.players = [p for p in room.players if p.guest_id != guest_id]
-
-        if room.host_id == guest_id and room.players:
-            room.host_id = room.players[0].guest_id
-
+        # A leave counts as room activity, so it is stamped in the same write.
         now = datetime.now(timezone.utc)
-        result = await collection.update_one(
+        leaving = _guest_id_literal(guest_id)
+        room_doc = await collection.find_one_and_update(
             {"_id": room_id},
-            {"$set": {
-                "players": [p.model_dump() for p in room.players],
-                "host_id": room.host_id,
-                "updated_at": now
-            }}
+            [
+                {"$set": {
+                    "players": {"$filter": {"input": "$players", "cond": {"$ne": ["$$this.guest_id", leaving]}}},
+                    "updated_at": now,
+                    "last_activity": now,
+                    "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}
+                }},
+                # This stage sees the filtered players, so the first remaining player becomes host.
+                {"$set": {
+                    "host_id": {"$cond": [
+                        {"$and": [{"$eq": ["$host_id", leaving]}, {"$gt": [{"$size": "$players"}, 0]}]},
+                        {"$arrayElemAt": ["$players.guest_id", 0]},
+                        "$host_id"
+                    ]}
+                }}
+            ],
+            return_document=ReturnDocument.AFTER
         )
-
-        if result.modified_count == 1:
-            updated_room = await get_room_by_id(room_id)
-            return updated_room
-        else:
-            return None
+        return Room(**room_doc) if room_doc else None
 
     except Exception:
         return None
@@ -267,7 +284,8 @@ async def update_room_status(room_id: str, new_status: str) -> Optional[Room]:
             "$set": {
                 "status": new_status,
                 "updated_at": datetime.now(timezone.utc)
-            }
+            },
+            "$inc": {"version": 1}
         }
         
         result = await collection.update_one(
@@ -303,7 +321,7 @@ async def update_game_state(room_id: str, game_state: Dict[str, Any]) -> Optiona
         
         result = await collection.update_one(
             {"_id": room_id},
-            {"$set": update_data}
+            {"$set": update_data, "$inc": {"version": 1}}
         )
         
         if result.matched_count == 0:
@@ -315,16 +333,24 @@ async def update_game_state(room_id: str, game_state: Dict[str, Any]) -> Optiona
     except Exception:
         raise
 
+def _version_match(version: int) -> Any:
+    """Query value matching a stored `version`. Rooms written before versioning have no field and count as version 0."""
+    return version if version else {"$in": [0, None]}
+
 async def update_room(room_id: str, room: Room) -> Optional[Room]:
     """
     Updates an existing room with new data.
+    Every field of `room` is written, so the stored document is not read back and re-parsed:
+    the given object, stamped with the new `updated_at` and `version`, already is the updated room.
+    The write is a compare-and-swap on `version`: it only applies if nothing else wrote the room since
+    `room` was read, so concurrent read-modify-write cycles cannot silently overwrite each other.
     
     Args:
         room_id (str): The ID of the room to update.
         room (Room): The Room object containing the updated data.
         
     Returns:
-        Optional[Room]: The updated Room object if successful, None otherwise.
+        Optional[Room]: The updated Room object if successful, None if the room does not exist or has changed since it was read.
     """
     try:
         collection = await get_room_collection()
@@ -332,17 +358,19 @@ async def update_room(room_id: str, room: Room) -> Optional[Room]:
         
         room_dict = room.model_dump(by_alias=True, exclude_unset=True)
         room_dict['updated_at'] = current_time
+        room_dict['version'] = room.version + 1
         
         result = await collection.update_one(
-            {"_id": room_id},
+            {"_id": room_id, "version": _version_match(room.version)},
             {"$set": room_dict}
         )
         
         if result.matched_count == 0:
             return None
-            
-        updated_room = await collection.find_one({"_id": room_id})
-        return Room.model_validate(updated_room) if updated_room else None
+
+        room.updated_at = current_time
+        room.version += 1
+        return room
         
     except Exception:
         raise
@@ -350,6 +378,8 @@ async def update_room(room_id: str, room: Room) -> Optional[Room]:
 async def toggle_player_ready(room_id: str, player_id: str) -> Optional[Room]:
     """
     Toggles the ready status of a specific player within a room.
+    The flip is a single pipeline update on that player's `is_ready`, so it never rewrites hands
+    or other players that a concurrent game action may be changing.
     
     Args:
         room_id (str): The ID of the room.
@@ -359,47 +389,29 @@ async def toggle_player_ready(room_id: str, player_id: str) -> Optional[Room]:
         Optional[Room]: The updated Room object if the status was toggled, None otherwise.
     """
     try:
-        room = await get_room_by_id(room_id=room_id)
-        if not room:
-            return None
-            
-        updated_players = []
-        player_found = False
-        
-        for player in room.players:
-            if player.guest_id == player_id:
-                player.is_ready = not player.is_ready
-                player_found = True
-            updated_players.append(player)
-        
-        if not player_found:
-            return None
-            
-        room.players = updated_players
-        room.updated_at = datetime.now(timezone.utc)
-        
-        try:
-            collection = await get_room_collection()
-            update_data = {
-                "$set": {
-                    "players": [p.model_dump() for p in room.players],
-                    "updated_at": room.updated_at
-                }
-            }
-            
-            result = await collection.update_one({"_id": room_id}, update_data)
-            
-            if result.modified_count == 1:
-                return room
-            else:
-                return None
-        except Exception:
-            raise
+        collection = await get_room_collection()
+        toggled = _guest_id_literal(player_id)
+        room_doc = await collection.find_one_and_update(
+            {"_id": room_id, "players.guest_id": player_id},
+            [
+                {"$set": {
+                    "players": {"$map": {"input": "$players", "in": {"$cond": [
+                        {"$eq": ["$$this.guest_id", toggled]},
+                        {"$mergeObjects": ["$$this", {"is_ready": {"$not": ["$$this.is_ready"]}}]},
+                        "$$this"
+                    ]}}},
+                    "updated_at": datetime.now(timezone.utc),
+                    "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}
+                }}
+            ],
+            return_document=ReturnDocument.AFTER
+        )
+        return Room.model_validate(room_doc) if room_doc else None
             
     except Exception:
         raise
 
-def _create_deck(settings) -> List[Card]:
+def _create_deck(settings) -> List[int]:
     """
     Creates a standard deck of cards based on the provided game settings.
     
@@ -407,17 +419,37 @@ def _create_deck(settings) -> List[Card]:
         settings: The game settings, including number of decks and joker inclusion.
         
     Returns:
-        List[Card]: A shuffled list of Card objects representing the deck.
+        List[int]: A shuffled deck of packed card keys, top card last.
     """
-    suits = ["H", "D", "C", "S"]
-    ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
-    deck = [Card(id=f"{suit}{rank}-{i}", suit=suit, rank=rank, deckId=i) for i in range(settings.number_of_decks) for suit in suits for rank in ranks]
-    if settings.include_jokers:
-        for i in range(settings.number_of_decks):
-            deck.append(Card(id=f"Joker-Red-{i}", suit="Red", rank="Joker", deckId=i))
-            deck.append(Card(id=f"Joker-Black-{i}", suit="Black", rank="Joker", deckId=i))
-    random.shuffle(deck)
-    return deck
+    return shuffled_keys(settings.number_of_decks, settings.include_jokers)
+
+
+def _deal_new_game(room: Room) -> None:
+    """
+    Shuffles a fresh deck, deals each player's opening hand and resets `room` to a newly started game.
+    Shared by `start_game` and `restart_game`.
+    
+    Args:
+        room (Room): The room to start a game in. Modified in place.
+    """
+    deck = _create_deck(room.settings)
+    
+    # Deal round-robin from the top: the reversed tail is in draw order, so each player takes every n-th card.
+    n_players = len(room.players)
+    k = min(n_players * room.settings.initial_deal_count, len(deck)) if n_players else 0
+    tail = deck[len(deck) - k:][::-1]
+    del deck[len(deck) - k:]
+    for i, player in enumerate(room.players):
+        player.hand = [decode(key) for key in tail[i::n_players]]
+
+    room.game_state = CardGameSpecificState(
+        status="active",
+        deck=deck,
+        current_turn_guest_id=room.players[0].guest_id,
+        turn_order=[p.guest_id for p in room.players],
+        current_player_index=0
+    )
+    room.status = "active"
 
 
 async def start_game(room_id: str) -> Optional[Room]:
@@ -428,40 +460,16 @@ async def start_game(room_id: str) -> Optional[Room]:
         room_id (str): The ID of the room to start the game in.
         
     Returns:
-        Optional[Room]: The updated Room object with the initialized game state, None if room not found or error.
+        Optional[Room]: The updated Room object with the initialized game state, None if room not found, changed since it was read, or error.
     """
     try:
-        collection = await get_room_collection()
         room = await get_room_by_id(room_id)
         if not room:
             return None
 
-        deck = _create_deck(room.settings)
-        
-        player_hands = {p.guest_id: [deck.pop() for _ in range(room.settings.initial_deal_count)] for p in room.players}
-
-        for player in room.players:
-            player.hand = player_hands.get(player.guest_id, [])
-
-        room.game_state = CardGameSpecificState(
-            status="active",
-            deck=deck,
-            current_turn_guest_id=room.players[0].guest_id,
-            turn_order=[p.guest_id for p in room.players],
-            current_player_index=0,
-            last_action_description=None,
-            winner_guest_id=None,
-            last_player_id=None,
-            last_played_or_discarded_cards={}
-        )
-        room.status = "active"
+        _deal_new_game(room)
         
-        await collection.update_one(
-            {"_id": room_id},
-            {"$set": room.model_dump(by_alias=True)}
-        )
-        
-        return await get_room_by_id(room_id)
+        return await update_room(room_id, room)
     except Exception:
         return None
 
@@ -475,49 +483,19 @@ async def restart_game(room_id: str) -> Optional[Room]:
         room_id (str): The ID of the room to restart.
         
     Returns:
-        Optional[Room]: The updated Room object with the restarted game state, None if room not found or error.
+        Optional[Room]: The updated Room object with the restarted game state, None if room not found, changed since it was read, or error.
     """
     try:
-        collection = await get_room_collection()
         room = await get_room_by_id(room_id)
         if not room:
             return None
 
         for player in room.players:
-            player.hand = []
             player.is_ready = True
 
-        deck = _create_deck(room.settings)
-        
-        player_hands = {p.guest_id: [deck.pop() for _ in range(room.settings.initial_deal_count)] for p in room.players}
-        for player in room.players:
-            player.hand = player_hands.get(player.guest_id, [])
-
-        room.game_state = CardGameSpecificState(
-            status="active",
-            deck=deck,
-            current_turn_guest_id=room.players[0].guest_id,
-            turn_order=[p.guest_id for p in room.players],
-            current_player_index=0,
-            discard_pile=[],
-            table=[],
-            turn_number=0,
-            last_action_description=None,
-            winner_guest_id=None,
-            last_player_id=None,
-            last_played_or_discarded_cards={}
-        )
-        room.status = "active"
-
-        result = await collection.update_one(
-            {"_id": room_id},
-            {"$set": room.model_dump(by_alias=True)}
-        )
+        _deal_new_game(room)
 
-        if result.modified_count == 1:
-            return await get_room_by_id(room_id)
-        else:
-            return None
+        return await update_room(room_id, room)
 
     except Exception:
         return None
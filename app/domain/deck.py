@@ -0,0 +1,42 @@
+"""
+Deck helpers working on packed `Card.key()` values, the form a game's deck is stored in.
+"""
+from typing import List
+import random
+
+from app.models.room import Card, CARDS_BY_KEY, MAX_DECKS, JOKER_RANK
+
+# Unshuffled `MAX_DECKS` decks of packed keys, keyed by `include_jokers` and computed once at import.
+# `CARDS_BY_KEY` holds whole decks one after another, so a prefix of a template is exactly `num_decks` decks.
+_KEY_TEMPLATES = {
+    include_jokers: [key for key, card in CARDS_BY_KEY.items() if include_jokers or card.rank != JOKER_RANK]
+    for include_jokers in (False, True)
+}
+
+def shuffled_keys(num_decks: int = 1, include_jokers: bool = False) -> List[int]:
+    """
+    Returns a freshly shuffled deck as packed `Card.key()` values.
+    This is a slice copy of a precomputed key template and one shuffle; no Card objects are built.
+
+    Args:
+        num_decks (int): The number of standard 52-card decks to include.
+        include_jokers (bool): Whether to include two jokers per deck.
+
+    Returns:
+        List[int]: The shuffled deck, top card last.
+    """
+    if num_decks > MAX_DECKS:
+        raise ValueError(f"At most {MAX_DECKS} decks are supported")
+    template = _KEY_TEMPLATES[include_jokers]
+    keys = template[:num_decks * len(template) // MAX_DECKS]
+    random.shuffle(keys)
+    return keys
+
+def decode(code: int) -> Card:
+    """
+    Returns the card identified by a packed `Card.key()` value.
+
+    Raises:
+        KeyError: If the code does not identify a known card.
+    """
+    return CARDS_BY_KEY[code]
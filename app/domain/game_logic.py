@@ -2,7 +2,8 @@ from typing import List, Dict
 """
 Core game logic for the card game.
 """
-from app.models.room import Room, Card
+from app.models.room import Room, Card, PlayerInRoom
+from app.domain.deck import decode, shuffled_keys
 import random
 import uuid
 
@@ -18,12 +19,11 @@ def play_cards(room: Room, player_index: int, cards: list[Card]):
     if not room.game_state:
         return
     player = room.players[player_index]
-    for card in cards:
-        if card in player.hand:
-            player.hand.remove(card)
+    keys_to_remove = {card.key() for card in cards}
+    player.hand[:] = [card for card in player.hand if card.key() not in keys_to_remove]
     room.game_state.table.append(cards)
     room.game_state.last_player_id = player.guest_id
-    room.game_state.last_played_or_discarded_cards[player.guest_id] = cards
+    room.game_state.last_cards = cards
 
 def discard_cards(room: Room, player_index: int, cards: list[Card]):
     """
@@ -37,12 +37,12 @@ def discard_cards(room: Room, player_index: int, cards: list[Card]):
     if not room.game_state:
         return
     player = room.players[player_index]
-    for card in cards:
-        if card in player.hand:
-            player.hand.remove(card)
-            room.game_state.discard_pile.append(card)
+    hand_keys = {card.key() for card in player.hand}
+    keys_to_remove = {card.key() for card in cards}
+    room.game_state.discard_pile.extend(card for card in cards if card.key() in hand_keys)
+    player.hand[:] = [card for card in player.hand if card.key() not in keys_to_remove]
     room.game_state.last_player_id = player.guest_id
-    room.game_state.last_played_or_discarded_cards[player.guest_id] = cards
+    room.game_state.last_cards = cards
 
 def recall_cards(room: Room, player_index: int):
     """
@@ -61,7 +61,7 @@ def recall_cards(room: Room, player_index: int):
     if room.game_state.last_player_id != player_id:
         return
 
-    cards_to_recall = room.game_state.last_played_or_discarded_cards.get(player_id)
+    cards_to_recall = room.game_state.last_cards
 
     if cards_to_recall:
         try:
@@ -70,7 +70,7 @@ def recall_cards(room: Room, player_index: int):
             pass
 
         player.hand.extend(cards_to_recall)
-        room.game_state.last_played_or_discarded_cards.pop(player_id, None)
+        room.game_state.last_cards = []
         room.game_state.last_player_id = None
 
 def move_cards_to_player(room: Room, source_player_index: int, cards: List[Card], target_player_id: str):
@@ -84,37 +84,17 @@ def move_cards_to_player(room: Room, source_player_index: int, cards: List[Card]
         target_player_id (str): The ID of the player receiving cards.
     """
     source_player = room.players[source_player_index]
-    target_player = next((p for p in room.players if p.guest_id == target_player_id), None)
+    target_index = room.guest_index.get(target_player_id)
 
-    if target_player:
-        for card in cards:
-            if card in source_player.hand:
-                source_player.hand.remove(card)
-                target_player.hand.append(card)
+    # `MoveCardsToPlayerAction` rejects self-targets; moving to the same hand would drop the cards entirely.
+    assert target_index != source_player_index, "cannot move cards to the same player"
 
-def create_deck(num_decks: int = 1, include_jokers: bool = False) -> List[Card]:
-    """
-    Creates a standard deck of cards based on the specified number of decks and joker inclusion.
-    
-    Args:
-        num_decks (int): The number of standard 52-card decks to include.
-        include_jokers (bool): Whether to include two jokers per deck.
-        
-    Returns:
-        List[Card]: A list of Card objects representing the newly created deck.
-    """
-    suits = ['H', 'D', 'C', 'S']
-    ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    deck = []
-    for deck_id in range(num_decks):
-        for suit in suits:
-            for rank in ranks:
-                card_id = f"{suit}{rank}-{deck_id}"
-                deck.append(Card(id=card_id, suit=suit, rank=rank, deckId=deck_id))
-        if include_jokers:
-            deck.append(Card(id=f"Joker-Red-{deck_id}", suit="Red", rank="Joker", deckId=deck_id))
-            deck.append(Card(id=f"Joker-Black-{deck_id}", suit="Black", rank="Joker", deckId=deck_id))
-    return deck
+    if target_index is not None:
+        target_player = room.players[target_index]
+        hand_keys = {card.key() for card in source_player.hand}
+        keys_to_move = {card.key() for card in cards}
+        target_player.hand.extend(card for card in cards if card.key() in hand_keys)
+        source_player.hand[:] = [card for card in source_player.hand if card.key() not in keys_to_move]
 
 def shuffle_deck(room: Room):
     """
@@ -125,12 +105,11 @@ def shuffle_deck(room: Room):
     """
     if not room.game_state:
         return
-    cards_to_shuffle = []
+    deck = room.game_state.deck
     for pile in room.game_state.table:
-        cards_to_shuffle.extend(pile)
-    room.game_state.deck.extend(cards_to_shuffle)
+        deck.extend(card.key() for card in pile)
     room.game_state.table.clear()
-    random.shuffle(room.game_state.deck)
+    random.shuffle(deck)
 
 
 def deal_cards(room: Room, count: int):
@@ -141,37 +120,41 @@ def deal_cards(room: Room, count: int):
         room (Room): The current game room object.
         count (int): The number of cards to deal to each player.
     """
-    if not room.game_state:
+    if not room.game_state or not room.players:
         return
-    for _ in range(count):
-        for player in room.players:
-            if room.game_state.deck:
-                card = room.game_state.deck.pop()
-                player.hand.append(card)
+    deck = room.game_state.deck
+    n_players = len(room.players)
+    k = min(count * n_players, len(deck))
+    if k <= 0:
+        return
+    # Take the whole tail in one slice; reversed, it is in pop order, so striding it
+    # reproduces the round-robin deal (first player gets the top card, and so on).
+    tail = [decode(key) for key in deck[-k:][::-1]]
+    del deck[-k:]
+    for i, player in enumerate(room.players):
+        player.hand.extend(tail[i::n_players])
 
 
-def initialize_game_state(room_id: str, settings: dict, players: list[dict]) -> dict:
+def initialize_game_state(room_id: str, settings: dict, players: List[PlayerInRoom]) -> dict:
     """
     Initializes a new game state for a room, including creating and shuffling a deck.
     
     Args:
         room_id (str): The ID of the room.
         settings (dict): Dictionary of game settings.
-        players (list[dict]): List of player dictionaries.
+        players (List[PlayerInRoom]): The room's players, passed through as-is rather than dumped to dicts.
         
     Returns:
         dict: The initialized game state dictionary.
     """
     num_decks = settings.get("number_of_decks", 1)
     include_jokers = settings.get("include_jokers", False)
-    initial_deck = create_deck(num_decks, include_jokers)
-    random.shuffle(initial_deck)
 
     return {
         "room_id": room_id,
         "status": "active",
         "players": players,
-        "deck": [card.model_dump() for card in initial_deck],
+        "deck": shuffled_keys(num_decks, include_jokers),
         "table": [],
         "discard_pile": [],
         "current_turn": 0,
@@ -188,9 +171,26 @@ def draw_card(room: Room, player_index: int):
     if not room.game_state or not room.game_state.deck:
         return
     player = room.players[player_index]
-    card = room.game_state.deck.pop()
+    card = decode(room.game_state.deck.pop())
     player.hand.append(card)
 
+def draw_many(room: Room, player_index: int, n: int):
+    """
+    Draws up to `n` cards from the top of the deck into a player's hand with a single slice.
+    
+    Args:
+        room (Room): The current game room object.
+        player_index (int): The index of the player drawing the cards.
+        n (int): The number of cards to draw.
+    """
+    if not room.game_state or not room.game_state.deck or n <= 0:
+        return
+    deck = room.game_state.deck
+    k = min(n, len(deck))
+    player = room.players[player_index]
+    player.hand.extend(decode(key) for key in deck[-k:][::-1])
+    del deck[-k:]
+
 def draw_to_discard(room: Room):
     """
     Draws a single card from the deck and places it directly into the discard pile.
@@ -200,7 +200,7 @@ def draw_to_discard(room: Room):
     """
     if not room.game_state or not room.game_state.deck:
         return
-    card = room.game_state.deck.pop()
+    card = decode(room.game_state.deck.pop())
     room.game_state.discard_pile.append(card)
 
 def draw_from_discard(room: Room, player_index: int):
@@ -1,14 +1,98 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from typing import Annotated, List, Optional, Dict, Any
+from pydantic import BaseModel, BeforeValidator, Field, field_validator, ConfigDict, TypeAdapter, computed_field, field_serializer
+from dataclasses import dataclass
 from datetime import datetime, timezone
 import uuid
 
-class Card(BaseModel):
-    """Represents a single playing card."""
-    id: str = Field(..., description="Unique ID for the card (e.g., 'H7', 'SK')")
-    suit: str = Field(..., description="Suit of the card (H, D, C, S)")
-    rank: str = Field(..., description="Rank of the card (2-10, J, Q, K, A)")
-    deckId: int = Field(..., description="The ID of the deck this card belongs to (for multi-deck games)")
+# Card vocabulary. The position of each value is its ordinal in packed card representations.
+SUITS = ('H', 'D', 'C', 'S', 'Red', 'Black')
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A', 'Joker')
+STANDARD_SUITS = SUITS[:4]
+STANDARD_RANKS = RANKS[:13]
+JOKER_SUITS = SUITS[4:]
+JOKER_RANK = RANKS[13]
+SUIT_ORD = {suit: i for i, suit in enumerate(SUITS)}
+RANK_ORD = {rank: i for i, rank in enumerate(RANKS)}
+
+# Highest `RoomSettings.number_of_decks`; bounds the set of cards that can appear in a game.
+MAX_DECKS = 4
+
+def _utcnow() -> datetime:
+    """Timezone-aware current UTC time, used as the default for timestamp fields."""
+    return datetime.now(timezone.utc)
+
+@dataclass(frozen=True, slots=True)
+class Card:
+    """
+    Represents a single playing card.
+
+    Cards come from the trusted deck generator, so Card is a plain frozen dataclass rather than a
+    pydantic model: construction is cheap, instances are small and hashable, and pydantic still
+    validates Card fields wherever a model embeds them (hands, piles, inbound action payloads).
+
+    Attributes:
+        id: Unique ID for the card (e.g., 'H7-0', 'Joker-Red-0').
+        suit: Suit of the card (H, D, C, S, or Red/Black for jokers).
+        rank: Rank of the card (2-10, J, Q, K, A, or Joker).
+        deckId: The ID of the deck this card belongs to (for multi-deck games).
+    """
+    id: str
+    suit: str
+    rank: str
+    deckId: int
+
+    def key(self) -> int:
+        """
+        Packs the card's identity into a single integer: `(deckId << 8) | (suit << 4) | rank`.
+        Keys are cheap to hash and compare, so hot loops should operate on them instead of Card objects.
+        """
+        return (self.deckId << 8) | (SUIT_ORD[self.suit] << 4) | RANK_ORD[self.rank]
+
+def _build_card_table() -> Dict[int, Card]:
+    """Builds every card that can appear in a game, keyed by `Card.key()`."""
+    cards = {}
+    for deck_id in range(MAX_DECKS):
+        for suit in STANDARD_SUITS:
+            for rank in STANDARD_RANKS:
+                card = Card(id=f"{suit}{rank}-{deck_id}", suit=suit, rank=rank, deckId=deck_id)
+                cards[card.key()] = card
+        for suit in JOKER_SUITS:
+            card = Card(id=f"Joker-{suit}-{deck_id}", suit=suit, rank=JOKER_RANK, deckId=deck_id)
+            cards[card.key()] = card
+    return cards
+
+# Cards are immutable values, so a decoded key always maps to the same shared instance.
+CARDS_BY_KEY = _build_card_table()
+
+def _card_dict_key(card: dict) -> int:
+    """Packs a card dict (as stored in MongoDB or sent by clients) the same way as `Card.key()`."""
+    return (card['deckId'] << 8) | (SUIT_ORD[card['suit']] << 4) | RANK_ORD[card['rank']]
+
+def _pack_card(card: Any) -> Any:
+    """Converts a Card, or a card dict as stored in MongoDB, to its packed key. Anything else is passed through for validation."""
+    if isinstance(card, Card):
+        return card.key()
+    if isinstance(card, dict):
+        return _card_dict_key(card)
+    return card
+
+def _intern_card(value: Any) -> Any:
+    """
+    Resolves a card dict to its shared instance in `CARDS_BY_KEY`, so hands, piles and action payloads
+    all reference the same Card objects instead of building a new one per occurrence. Anything that is
+    not an exact match for a known card is left to normal validation.
+    """
+    if isinstance(value, dict):
+        try:
+            card = CARDS_BY_KEY.get(_card_dict_key(value))
+        except (KeyError, TypeError):
+            return value
+        if card is not None and card.id == value.get('id'):
+            return card
+    return value
+
+# Card type for model fields: validates like Card, but known cards resolve to their shared instance.
+InternedCard = Annotated[Card, BeforeValidator(_intern_card)]
 
 class PlayerInRoom(BaseModel):
     """Represents a player within a specific game room."""
@@ -16,7 +100,10 @@ class PlayerInRoom(BaseModel):
     nickname: Optional[str] = Field(None, description="Player's chosen nickname.")
     sid: Optional[str] = Field(None, description="Current Socket.IO session ID of the player.")
     is_ready: bool = Field(default=False, description="Indicates if the player is ready to start the game.")
-    hand: List[Card] = Field(default_factory=list, description="The list of cards currently in the player's hand.")
+    hand: List[InternedCard] = Field(default_factory=list, description="The list of cards currently in the player's hand.")
+
+# Adapter for bulk validation of card lists: one call into pydantic-core instead of one per element.
+CARD_LIST_ADAPTER = TypeAdapter(List[InternedCard])
 
 class RoomSettings(BaseModel):
     """Configurable settings for a game room."""
@@ -28,7 +115,7 @@ class RoomSettings(BaseModel):
 class PlayedHand(BaseModel):
     """Represents a set of cards played by a player in a single turn."""
     player_id: str = Field(..., description="The ID of the player who played this hand.")
-    cards: List[Card] = Field(default_factory=list, description="The cards played in this hand.")
+    cards: List[InternedCard] = Field(default_factory=list, description="The cards played in this hand.")
 
 class CardGameSpecificState(BaseModel):
     """Represents the dynamic state of an ongoing card game within a room."""
@@ -37,19 +124,37 @@ class CardGameSpecificState(BaseModel):
     current_player_index: Optional[int] = Field(None, description="The index of the current player in the turn order list.")
     turn_number: int = Field(default=0, description="The current turn number in the game.")
     turn_order: List[str] = Field(default_factory=list, description="Ordered list of guest IDs defining the turn sequence.")
-    deck: List[Card] = Field(default_factory=list, description="Cards remaining in the main draw deck.")
-    discard_pile: List[Card] = Field(default_factory=list, description="Cards in the discard pile.")
-    table: List[List[Card]] = Field(default_factory=list, description="Cards currently on the table, organized by played sets.")
+    deck: List[int] = Field(default_factory=list, description="Cards remaining in the main draw deck, held as packed `Card.key()` values and serialized as cards.")
+    discard_pile: List[InternedCard] = Field(default_factory=list, description="Cards in the discard pile.")
+    table: List[List[InternedCard]] = Field(default_factory=list, description="Cards currently on the table, organized by played sets.")
     last_action_description: Optional[str] = Field(None, description="A brief description of the last significant game action.")
     winner_guest_id: Optional[str] = Field(None, description="The guest ID of the game winner, if the game has finished.")
     last_player_id: Optional[str] = Field(None, description="The guest ID of the player who last played or discarded cards.")
-    last_played_or_discarded_cards: Dict[str, List[Card]] = Field(default_factory=dict, description="A map storing the last cards played or discarded by each player, for recall functionality.")
+    last_cards: List[InternedCard] = Field(default_factory=list, description="The cards last played or discarded by `last_player_id`, for recall functionality.")
 
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True
     )
 
+    @field_validator('deck', mode='before')
+    @classmethod
+    def _pack_deck(cls, value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+        # Raised as ValueError so a malformed stored card surfaces as a ValidationError, not a bare KeyError.
+        try:
+            keys = [_pack_card(card) for card in value]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed card in deck: {e!r}") from None
+        if any(type(key) is int and key not in CARDS_BY_KEY for key in keys):
+            raise ValueError("Unknown card in deck")
+        return keys
+
+    @field_serializer('deck')
+    def _expand_deck(self, deck: List[int]) -> List[Card]:
+        return [CARDS_BY_KEY[key] for key in deck]
+
 class Room(BaseModel):
     """Represents a game room, storing its configuration, players, and current game state."""
     room_id: str = Field(..., alias='_id', description="Unique identifier for the room (MongoDB _id alias).")
@@ -60,15 +165,24 @@ class Room(BaseModel):
     game_type: Optional[str] = Field(None, description="The type of card game being played in this room.")
     settings: RoomSettings = Field(default_factory=RoomSettings, description="Configurable settings for the game room.")
     game_state: Optional[CardGameSpecificState] = Field(None, description="The current state of the game if it has started.")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Timestamp when the room was created.")
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Timestamp of the last update to the room.")
-    last_activity: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Timestamp of the last activity in the room, used for cleanup.")
+    created_at: datetime = Field(default_factory=_utcnow, description="Timestamp when the room was created.")
+    updated_at: datetime = Field(default_factory=_utcnow, description="Timestamp of the last update to the room.")
+    last_activity: datetime = Field(default_factory=_utcnow, description="Timestamp of the last activity in the room, used for cleanup.")
+    version: int = Field(default=0, description="Incremented by every write to the room; `update_room` only writes over the version it read.")
 
     model_config = ConfigDict(
         populate_by_name=True,
         json_encoders={datetime: lambda dt: dt.isoformat()}
     )
 
+    @property
+    def guest_index(self) -> Dict[str, int]:
+        """
+        Maps each player's guest ID to their index in `players`, for O(1) membership checks and lookups.
+        Built on every access, so it always matches the current `players`; keep the result in a local when looking up several IDs.
+        """
+        return {p.guest_id: i for i, p in enumerate(self.players)}
+
 class RoomCreateRequest(BaseModel):
     """Request model for creating a new game room."""
     name: Optional[str] = Field(None, description="Desired name for the new room.")
@@ -91,26 +205,18 @@ class RoomResponse(BaseModel):
     settings: RoomSettings = Field(..., description="Configurable settings for the game room.")
     game_state: Optional[CardGameSpecificState] = Field(None, description="The current state of the game if active.")
     created_at: datetime = Field(..., description="Timestamp when the room was created.")
-    current_players: int = Field(..., description="Number of players currently in the room.")
     players: List[PlayerInRoom] = Field(..., description="List of players in the room.")
     last_activity: datetime = Field(..., description="Timestamp of the last activity in the room.")
 
+    @computed_field(description="Number of players currently in the room.")
+    @property
+    def current_players(self) -> int:
+        return len(self.players)
+
     @classmethod
     def from_orm(cls, obj: Any) -> "RoomResponse":
         """
         Creates a RoomResponse instance from a Room ORM object.
-        This custom method ensures all fields, including derived ones like `current_players`, are populated.
+        Fields are read straight off the object by pydantic-core; `current_players` is derived from `players`.
         """
-        return cls(
-            room_id=str(obj.room_id),
-            name=obj.name,
-            host_id=obj.host_id,
-            status=obj.status,
-            game_type=obj.game_type,
-            settings=obj.settings,
-            game_state=obj.game_state,
-            created_at=obj.created_at,
-            current_players=len(obj.players) if obj.players else 0,
-            players=obj.players,
-            last_activity=obj.last_activity
-        )
+        return cls.model_validate(obj, from_attributes=True)
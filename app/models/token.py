@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from dataclasses import dataclass
 from typing import Optional
 
 class GuestLoginRequest(BaseModel):
@@ -16,10 +17,13 @@ class Token(BaseModel):
     token_type: str
     user_id: str
 
-class TokenData(BaseModel):
+@dataclass(frozen=True, slots=True)
+class TokenData:
     """
     Data encoded within the JWT.
     'sub' (subject) will hold the unique guest identifier.
+    Built once per authenticated request from an already-verified token payload, so it is a plain
+    dataclass rather than a validating model. It is never used as a request or response body.
     """
     sub: str # Subject (unique guest ID, e.g., a UUID string)
     nickname: Optional[str] = None
@@ -1,18 +1,24 @@
-from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.models.room import CardGameSpecificState
 
 if TYPE_CHECKING:
     from app.models.room import Room
 
+# Returned by `PlayerAction.apply` when the action left the room as it was, so the caller can skip
+# persisting and broadcasting the room.
+UNCHANGED = object()
 
-class PlayerAction(BaseModel, ABC):
-    @abstractmethod
+
+class PlayerAction(BaseModel):
+    # Most action types are rare in a session, so their core schemas are built on first use rather than at import.
+    model_config = ConfigDict(defer_build=True)
+
+    # Subclasses override both methods. These are plain defaults rather than ABC abstract methods,
+    # so constructing an action does not go through ABCMeta's abstract-method check.
     def validate_action(self, player_index: int, game_state: CardGameSpecificState, room: 'Room'):
         raise NotImplementedError
 
-    @abstractmethod
     def apply(self, game_state: CardGameSpecificState, player_index: int, room: 'Room'):
         raise NotImplementedError
 
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING, List
-from app.models.room import Card, CardGameSpecificState
-from app.websocket.actions.base import HostAction, PlayerAction
+from pydantic import ConfigDict, Field
+from app.models.room import Card, CardGameSpecificState, InternedCard
+from app.websocket.actions.base import HostAction, PlayerAction, UNCHANGED
 from app.domain import game_logic
 
 if TYPE_CHECKING:
@@ -18,7 +19,10 @@ class BasePlayerAction(PlayerAction):
         return room.players[player_index]
 
     def validate_card_ownership(self, player, cards: List[Card]):
-        if not all(card in player.hand for card in cards):
+        # Cards are hashable, so this is one set build plus O(len(cards)) lookups instead of a hand scan per card.
+        # Comparing set sizes also rejects the same card being listed twice.
+        unique_cards = set(cards)
+        if len(unique_cards) != len(cards) or not unique_cards.issubset(player.hand):
             raise ValueError("Player does not have all of these cards")
 
     def validate_cards_on_table(self, game_state: CardGameSpecificState):
@@ -34,12 +38,12 @@ class BasePlayerAction(PlayerAction):
             raise ValueError("No cards in discard pile to draw")
 
     def validate_target_player(self, target_player_id: str, room: 'Room'):
-        if not any(p.guest_id == target_player_id for p in room.players):
+        if target_player_id not in room.guest_index:
             raise ValueError("Target player not found in the room")
 
 
 class PlayCardsAction(BasePlayerAction):
-    cards: List[Card]
+    cards: List[InternedCard]
 
     def validate_action(self, player_index: int, game_state: CardGameSpecificState, room: 'Room'):
         self.validate_game_started(game_state)
@@ -51,7 +55,7 @@ class PlayCardsAction(BasePlayerAction):
 
 
 class DiscardCardsAction(BasePlayerAction):
-    cards: list[Card]
+    cards: list[InternedCard]
 
     def validate_action(self, player_index: int, game_state: CardGameSpecificState, room: 'Room'):
         player = self.validate_player_exists(player_index, room)
@@ -71,17 +75,17 @@ class RecallCardsAction(BasePlayerAction):
 
 
 class MoveCardsToPlayerAction(BasePlayerAction):
-    cards: List[Card]
-    target_player_id: str
+    cards: List[InternedCard]
+    target_player_id: str = Field(alias="targetPlayerId")
 
-    class Config:
-        populate_by_name = True
-        alias_generator = lambda field_name: "".join([word.capitalize() if i > 0 else word for i, word in enumerate(field_name.split("_"))])
+    model_config = ConfigDict(populate_by_name=True)
 
     def validate_action(self, player_index: int, game_state: CardGameSpecificState, room: 'Room'):
         player = self.validate_player_exists(player_index, room)
         self.validate_card_ownership(player, self.cards)
         self.validate_target_player(self.target_player_id, room)
+        if self.target_player_id == player.guest_id:
+            raise ValueError("Cannot move cards to yourself")
 
     def apply(self, game_state: CardGameSpecificState, player_index: int, room: 'Room'):
         game_logic.move_cards_to_player(room, player_index, self.cards, self.target_player_id)
@@ -126,11 +130,23 @@ class DrawFromDiscardAction(BasePlayerAction):
 
 
 class UpdateHandOrderAction(BasePlayerAction):
-    cards: List[Card]
+    cards: List[InternedCard]
 
     def validate_action(self, player_index: int, game_state: CardGameSpecificState, room: 'Room'):
         self.validate_player_exists(player_index, room)
 
     def apply(self, game_state: CardGameSpecificState, player_index: int, room: 'Room'):
         player = room.players[player_index]
+        # Drag-and-drop often ends where it started; nothing to save or broadcast then.
+        if self.cards == player.hand:
+            return UNCHANGED
         player.hand = self.cards
+
+
+def warm_up() -> None:
+    """
+    Builds now, instead of on the first event, the deferred schemas of the actions every game validates.
+    Card-list actions such as PlayCardsAction are built with model_construct and never use their own schema.
+    """
+    for action_class in (DealCardsAction, DrawCardAction):
+        action_class.model_rebuild(force=True)
@@ -0,0 +1,21 @@
+"""
+Registration of WebSocket event handlers on the Socket.IO server.
+"""
+import socketio
+
+from app.websocket.game_event_handler import GameEventHandler
+
+def bind_handlers(sio: socketio.AsyncServer, game_event_handler: GameEventHandler) -> None:
+    """
+    Registers every Socket.IO event handler exactly once.
+    Registration does not depend on runtime resources, so it happens at import time rather than in the app lifespan.
+    """
+    # Connection and disconnection event handlers
+    sio.on('connect', game_event_handler.handle_connect)
+    sio.on('disconnect', game_event_handler.handle_disconnect)
+
+    # Custom game-related event handlers
+    sio.on(game_event_handler.EVENT_JOIN_GAME_ROOM, game_event_handler.handle_join_game_room)
+    sio.on(game_event_handler.EVENT_LEAVE_GAME_ROOM, game_event_handler.handle_leave_game_room)
+    sio.on(game_event_handler.EVENT_START_GAME, game_event_handler.handle_start_game)
+    sio.on(game_event_handler.EVENT_PLAYER_ACTION, game_event_handler.handle_player_action)
@@ -1,16 +1,22 @@
 """
 WebSocket game event handlers for the card game.
 """
+import asyncio
+import functools
+import logging
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from weakref import WeakValueDictionary
 
 from fastapi import HTTPException
 
 import socketio
+from app.core.json_encoder import json_fragment
 from app.core.security import decode_access_token
 from app.crud import crud_room
 from app.domain.game_logic import initialize_game_state
-from app.models.room import Card, CardGameSpecificState, Room, RoomResponse, PlayerInRoom
+from app.models.room import Card, CardGameSpecificState, Room, RoomResponse, PlayerInRoom, CARD_LIST_ADAPTER
 
 from app.websocket.actions.player_actions import (
     DealCardsAction,
@@ -24,21 +30,99 @@ from app.websocket.actions.player_actions import (
     ShuffleDeckAction,
     UpdateHandOrderAction
 )
+from app.websocket.actions.base import UNCHANGED
+from app.websocket.manager import websocket_manager
+
+logger = logging.getLogger(__name__)
+
+# Actions whose only field is a card list. Their payload is validated once with the shared
+# CARD_LIST_ADAPTER and the action is built without running its own model validator again.
+_CARD_LIST_ACTIONS = frozenset({PlayCardsAction, DiscardCardsAction, UpdateHandOrderAction})
+
+def _reports_errors(event: str, error_msg: str):
+    """
+    Wrap a `(self, sid, data)` event handler so any failure is answered with `event` to the sender.
+    ValueErrors (bad payloads, rule violations, pydantic ValidationErrors) are expected and logged without a traceback.
+    """
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def wrapper(self, sid: str, data: Dict) -> None:
+            try:
+                await handler(self, sid, data)
+            except ValueError as e:
+                logger.debug("Rejected %s from %s: %s", handler.__name__, sid, e)
+                await self._handle_error(sid, event, data.get('room_id') if data else None, error_msg)
+            except Exception:
+                logger.exception("%s from %s failed", handler.__name__, sid)
+                await self._handle_error(sid, event, data.get('room_id') if data else None, error_msg)
+        return wrapper
+    return decorate
 
 class GameEventHandler:
     """Handlers for all WebSocket events."""
+    __slots__ = ('sio', '_pending_broadcasts', '_broadcast_tasks', '_action_windows', '_room_locks')
 
     EVENT_JOIN_GAME_ROOM = 'join_game_room'
     EVENT_LEAVE_GAME_ROOM = 'leave_game_room'
     EVENT_START_GAME = 'start_game'
     EVENT_PLAYER_ACTION = 'playerAction'
     EVENT_GAME_STATE_UPDATE = 'gameStateUpdate'
+    EVENT_GAME_STATE_DELTA = 'gameStateDelta'
     EVENT_PLAYER_JOINED = 'playerJoined'
     EVENT_PLAYER_LEFT = 'playerLeft'
 
+    # Maps each `playerAction` action_type to the action model that validates and applies it.
+    _ACTION_CLASSES = {
+        'PLAY_CARDS': PlayCardsAction,
+        'DISCARD_CARDS': DiscardCardsAction,
+        'DRAW_FROM_DISCARD': DrawFromDiscardAction,
+        'DRAW_TO_DISCARD': DrawToDiscardAction,
+        'RECALL_CARDS': RecallCardsAction,
+        'MOVE_CARDS_TO_PLAYER': MoveCardsToPlayerAction,
+        'SHUFFLE_DECK': ShuffleDeckAction,
+        'DEAL_CARDS': DealCardsAction,
+        'DRAW_CARD': DrawCardAction,
+        'UPDATE_HAND_ORDER': UpdateHandOrderAction,
+    }
+
+    # Error for every `_start_status` value, checked in the same order as before: host, then already
+    # started, then player count. Only status 0b101 (host, not active, enough players) may start.
+    _START_ERRORS = {
+        status: (
+            "Only the host can perform this action" if not status & 1
+            else "Game already started" if status & 2
+            else "At least 2 players are required to start" if not status & 4
+            else None
+        )
+        for status in range(8)
+    }
+
+    # Per-connection playerAction budget. Actions beyond the limit within one window are rejected
+    # before any session, DB or validation work is done.
+    ACTION_RATE_LIMIT = 30
+    ACTION_RATE_WINDOW_S = 1.0
+
+    # Times a playerAction is read, applied and written before giving up when other writes keep winning the race.
+    ACTION_WRITE_ATTEMPTS = 3
+
+    # Full-state broadcasts to the same room within this window are coalesced into a single emit of the latest state.
+    BROADCAST_COALESCE_S = 0.02
+
+    # Clients that join with `deltas: true` are also put in the companion room `<room_id>` + this suffix.
+    # After a player action they receive `gameStateDelta` (JSON Patch remove/replace ops) instead of the full state.
+    DELTA_ROOM_SUFFIX = ':delta'
+
     def __init__(self, sio: socketio.AsyncServer):
         self.sio = sio
-        self.sio.on(self.EVENT_PLAYER_ACTION, self.handle_player_action)
+        # Per room: [latest unsent room, its state dump, (op, path) changes] (the last two are None when a full
+        # state is required), and the flush tasks that will send them.
+        self._pending_broadcasts: Dict[str, List[Any]] = {}
+        self._broadcast_tasks: Set[asyncio.Task] = set()
+        # sid -> [window start (monotonic seconds), actions in window] for rate limiting playerAction.
+        self._action_windows: Dict[str, List[float]] = {}
+        # room_id -> lock serializing this process's read-modify-write cycles on that room. Entries disappear once
+        # no handler holds or waits on the lock; writes from elsewhere are still caught by the version check.
+        self._room_locks: 'WeakValueDictionary[str, asyncio.Lock]' = WeakValueDictionary()
 
     async def handle_connect(self, sid: str, environ: Dict, auth: Any) -> bool:
         """Handle new Socket.IO connections."""
@@ -66,53 +150,65 @@ class GameEventHandler:
         """
         Handle Socket.IO disconnections.
         """
+        self._action_windows.pop(sid, None)
         try:
             session = await self.sio.get_session(sid)
             guest_id = session.get('guest_id', 'Unknown Guest')
             nickname = session.get('nickname', 'N/A')
-            
 
-            joined_rooms_list = session.get('joined_rooms', [])
-            if not joined_rooms_list:
+            # The disconnect handler runs before the manager drops the sid from its rooms, so the
+            # adapter still lists every game room this socket joined. The sid's personal room and
+            # the namespace-wide `None` room are not game rooms.
+            rooms_snapshot = tuple(
+                room for room in self.sio.rooms(sid)
+                if room and room != sid and not room.endswith(self.DELTA_ROOM_SUFFIX)
+            )
+            if not rooms_snapshot:
                 return
 
-            
-            for room_id_to_leave in list(joined_rooms_list):
-                try:
-                    updated_room = await crud_room.remove_player_from_room(
-                        room_id=room_id_to_leave, 
-                        guest_id=guest_id
-                    )
-                    
-                    if not updated_room:
-                        continue
-                    
-                    # After removing the player, fetch the complete room state to ensure a consistent update
-                    # Instead of fetching the full state, just notify that a player left.
-                    await self.sio.emit(
-                        self.EVENT_PLAYER_LEFT,
-                        {'guest_id': guest_id},
-                        room=room_id_to_leave,
-                        skip_sid=sid  # The disconnected client doesn't need this
-                    )
-                    
-                    # Update last activity time
-                    updated_room.last_activity = datetime.now(timezone.utc)
-                    await crud_room.update_room(room_id_to_leave, updated_room)
-                    
-                except Exception:
-                    pass
-                    
+            # Rooms are independent, so leave them concurrently. Each leave is shielded so the
+            # socket teardown cancelling this handler cannot abandon a half-finished DB update.
+            await asyncio.gather(
+                *(asyncio.shield(self._leave_one_room(sid, guest_id, room_id)) for room_id in rooms_snapshot),
+                return_exceptions=True
+            )
+
         except Exception:
             pass
 
+    async def _leave_one_room(self, sid: str, guest_id: str, room_id: str) -> None:
+        """
+        Remove a disconnected player from one room and notify the others.
+        `remove_player_from_room` records the activity in the same write.
+        Failures are logged rather than raised so one room cannot affect cleanup of the others.
+        """
+        try:
+            async with self._room_lock(room_id):
+                updated_room = await crud_room.remove_player_from_room(
+                    room_id=room_id,
+                    guest_id=guest_id
+                )
+
+                # Nobody is left to notify once the last player is gone.
+                if not updated_room or not updated_room.players:
+                    websocket_manager.forget_room(room_id)
+                    return
+                self._supersede_broadcast(room_id, updated_room)
+
+                # Instead of broadcasting the full state, just notify that a player left.
+                await self.sio.emit(
+                    self.EVENT_PLAYER_LEFT,
+                    {'guest_id': guest_id},
+                    room=room_id,
+                    skip_sid=sid  # The disconnected client doesn't need this
+                )
+        except Exception:
+            logger.warning("Disconnect cleanup for room %s failed", room_id, exc_info=True)
+
     async def handle_join_game_room(self, sid: str, data: Dict[str, Any]) -> None:
         """
         Handle a client's request to join a specific game room's Socket.IO room.
         """
-        session = await self.sio.get_session(sid)
-        guest_id = session.get('guest_id', 'Unknown Guest')
-        nickname = session.get('nickname', 'N/A')
         room_id = data.get('room_id')
 
         if not room_id:
@@ -122,58 +218,57 @@ class GameEventHandler:
 
         try:
             await self.sio.enter_room(sid, room_id)
+            if data.get('deltas'):
+                await self.sio.enter_room(sid, self._delta_room(room_id))
 
-            if 'joined_rooms' not in session:
-                session['joined_rooms'] = []
-            if room_id not in session['joined_rooms']:
-                session['joined_rooms'].append(room_id)
-            await self.sio.save_session(sid, session)
+            session = await self.sio.get_session(sid)
+            guest_id = session.get('guest_id', 'Unknown Guest')
+            nickname = session.get('nickname', 'N/A')
 
             player_to_add = PlayerInRoom(
                 guest_id=guest_id,
                 nickname=nickname,
                 sid=sid
             )
-            updated_room = await crud_room.add_player_to_room(room_id=room_id, player=player_to_add)
-
-            if not updated_room:
-                await self.sio.emit('error', {'message': f'Failed to join room {room_id}.'}, to=sid)
-                return
-
-            # After adding the player, re-fetch the room to get the complete and updated player list
-            final_room_state = await crud_room.get_room_by_id(room_id)
-            if not final_room_state:
-                await self.sio.emit('error', {'message': 'Could not confirm join.'}, to=sid)
-                return
-
-            room_data_for_client = RoomResponse.from_orm(final_room_state).model_dump(by_alias=True)
-
-            # Send the full state ONLY to the player who just joined.
-            await self.sio.emit(
-                self.EVENT_GAME_STATE_UPDATE,
-                room_data_for_client,
-                to=sid
-            )
-
-            # Notify OTHER players in the room that a new player has joined.
-            await self.sio.emit(
-                self.EVENT_PLAYER_JOINED,
-                player_to_add.model_dump(),
-                room=room_id,
-                skip_sid=sid
-            )
-
-            await self._update_last_activity(room_id, updated_room)
+            async with self._room_lock(room_id):
+                try:
+                    updated_room = await crud_room.add_player_to_room(room_id=room_id, player=player_to_add)
+                except (crud_room.RoomNotFoundError, crud_room.RoomFullError):
+                    updated_room = None
+
+                if not updated_room:
+                    await self.sio.emit('error', {'message': f'Failed to join room {room_id}.'}, to=sid)
+                    return
+
+                self._supersede_broadcast(room_id, updated_room)
+                # add_player_to_room returns the document as it is after the update, so no re-fetch is needed.
+                room_data_for_client = self._room_payload(updated_room)
+
+                # The two emits go to disjoint recipients, so they are sent concurrently.
+                await asyncio.gather(
+                    # Send the full state ONLY to the player who just joined.
+                    self.sio.emit(
+                        self.EVENT_GAME_STATE_UPDATE,
+                        room_data_for_client,
+                        to=sid
+                    ),
+                    # Notify OTHER players in the room that a new player has joined.
+                    self.sio.emit(
+                        self.EVENT_PLAYER_JOINED,
+                        json_fragment(player_to_add),
+                        room=room_id,
+                        skip_sid=sid
+                    ),
+                )
 
-        except Exception as e:
+        except Exception:
+            logger.exception("Joining room %s failed for %s", room_id, sid)
             await self.sio.emit('error', {'message': f'Error joining room {room_id}.'}, to=sid)
 
     async def handle_leave_game_room(self, sid: str, data: Dict[str, Any]) -> None:
         """
         Handle a client's request to leave a specific game room's Socket.IO room.
         """
-        session = await self.sio.get_session(sid)
-        guest_id = session.get('guest_id', 'Unknown Guest')
         room_id = data.get('room_id')
 
         if not room_id:
@@ -181,110 +276,121 @@ class GameEventHandler:
 
         try:
             await self.sio.leave_room(sid, room_id)
-
-            if 'joined_rooms' in session and room_id in session['joined_rooms']:
-                session['joined_rooms'].remove(room_id)
-                await self.sio.save_session(sid, session)
-
+            await self.sio.leave_room(sid, self._delta_room(room_id))
         except Exception:
             pass
 
 
+    @_reports_errors('start_game_failed', "An error occurred during game start")
     async def handle_start_game(self, sid: str, data: Dict) -> None:
         """
         Handle game start request from room host.
         """
         
-        try:
-            session = await self._get_validated_session(sid)
-            guest_id = session['guest_id']
-            
-            if not data or 'room_id' not in data:
-                raise ValueError("Missing required fields: room_id")
-                
-            room_id = data['room_id']
+        session = await self._get_validated_session(sid)
+        guest_id = session['guest_id']
+        
+        if not data or 'room_id' not in data:
+            raise ValueError("Missing required fields: room_id")
             
+        room_id = data['room_id']
+        
+        async with self._room_lock(room_id):
             room = await self._get_room(room_id)
-            self._validate_host(room, guest_id)
-            
-            if room.status == 'active':
-                raise ValueError("Game already started")
-                
-            if len(room.players) < 2:
-                raise ValueError("At least 2 players are required to start")
-            
-            game_state_dict = initialize_game_state(room.room_id, room.settings.model_dump(), [p.model_dump() for p in room.players])
-            
+            start_error = self._START_ERRORS[self._start_status(room, guest_id)]
+            if start_error:
+                raise ValueError(start_error)
+        
+            game_state_dict = initialize_game_state(room.room_id, room.settings.model_dump(), room.players)
+        
             room.status = 'active'
             room.game_state = CardGameSpecificState(**game_state_dict)
             room.game_state.status = 'active'
-            updated_room = await self._update_room_and_broadcast(room_id, room)
-            
-        except Exception:
-            pass
-            await self._handle_error(sid, "start_game_failed", data.get('room_id') if data else None, "An error occurred during game start")
+            if await self._update_room_and_broadcast(room_id, room) is None:
+                raise ValueError(f"Failed to update room {room_id}")
 
+    @_reports_errors('player_action_failed', "An error occurred during player action")
     async def handle_player_action(self, sid: str, data: Dict) -> None:
         """
         Handle player game actions.
         """
+        if self._over_action_limit(sid):
+            await self._handle_error(sid, "player_action_failed", data.get('room_id') if data else None, "Too many actions, slow down")
+            return
+
+        session = await self._get_validated_session(sid)
+        guest_id = session['guest_id']
         
-        try:
-            session = await self._get_validated_session(sid)
-            guest_id = session['guest_id']
-            
-            if not data or 'room_id' not in data or 'action_type' not in data:
-                raise ValueError("Missing required fields: room_id and action_type")
-                
-            room_id = data['room_id']
-            action_type = data['action_type']
-            action_data = data.get('action_data', {})
+        if not data or 'room_id' not in data or 'action_type' not in data:
+            raise ValueError("Missing required fields: room_id and action_type")
             
-            room = await self._get_room(room_id)
-            self._validate_player_in_room(room, guest_id)
-            
-            if room.status != 'active' or not room.game_state:
-                raise ValueError("Game not in progress")
-                
-            action_classes = {
-                'PLAY_CARDS': PlayCardsAction,
-                'DISCARD_CARDS': DiscardCardsAction,
-                'DRAW_FROM_DISCARD': DrawFromDiscardAction,
-                'DRAW_TO_DISCARD': DrawToDiscardAction,
-                'RECALL_CARDS': RecallCardsAction,
-                'MOVE_CARDS_TO_PLAYER': MoveCardsToPlayerAction,
-                'SHUFFLE_DECK': ShuffleDeckAction,
-                'DEAL_CARDS': DealCardsAction,
-                'DRAW_CARD': DrawCardAction,
-                'UPDATE_HAND_ORDER': UpdateHandOrderAction,
-            }
+        room_id = data['room_id']
+        action_type = data['action_type']
+        action_data = data.get('action_data', {})
+        
+        action_class = self._ACTION_CLASSES.get(action_type)
+        if not action_class:
+            raise ValueError(f"Unknown action type: {action_type}")
+
+        # The write only lands if nobody else wrote the room since it was read (see `crud_room.update_room`).
+        # On a conflict the action is validated and applied again against a fresh read. The room lock keeps
+        # actions handled by this process from racing each other into those conflicts.
+        async with self._room_lock(room_id):
+            action = None
+            for _ in range(self.ACTION_WRITE_ATTEMPTS):
+                room = await self._get_room(room_id)
+                self._validate_player_in_room(room, guest_id)
             
-            action_class = action_classes.get(action_type)
-            if not action_class:
-                raise ValueError(f"Unknown action type: {action_type}")
-
-            # Instantiate the action using a factory-like approach
-            if action_type == 'DEAL_CARDS':
-                deal_count = action_data.get('count', room.settings.initial_deal_count)
-                action_data['count'] = int(deal_count)
-            elif action_type == 'UPDATE_HAND_ORDER':
-                action_data['cards'] = action_data.get('cards', [])
-            action = action_class(**action_data)
+                if room.status != 'active' or not room.game_state:
+                    raise ValueError("Game not in progress")
+
+                if action is None:
+                    # Instantiate the action using a factory-like approach
+                    if action_type == 'DEAL_CARDS':
+                        deal_count = action_data.get('count', room.settings.initial_deal_count)
+                        action_data['count'] = int(deal_count)
+                    elif action_type == 'UPDATE_HAND_ORDER':
+                        action_data['cards'] = action_data.get('cards', [])
+
+                    if action_class in _CARD_LIST_ACTIONS:
+                        if 'cards' not in action_data:
+                            raise ValueError("Missing required field: cards")
+                        action = action_class.model_construct(cards=CARD_LIST_ADAPTER.validate_python(action_data['cards']))
+                    else:
+                        action = action_class.model_validate(action_data)
             
-            player_index = -1
-            for i, p in enumerate(room.players):
-                if p.guest_id == guest_id:
-                    player_index = i
-                    break
+                player_index = room.guest_index.get(guest_id, -1)
             
-            action.validate_action(player_index, room.game_state, room)
-            action.apply(room.game_state, player_index, room)
+                action.validate_action(player_index, room.game_state, room)
+                # Delta subscribers are patched from the state as it was before this action.
+                prev_state = self._state_dict(room) if self._has_members(self._delta_room(room_id)) else None
+                if action.apply(room.game_state, player_index, room) is UNCHANGED:
+                    return
 
-            updated_room = await self._update_room_and_broadcast(room_id, room)
-            
-        except Exception:
-            pass
-            await self._handle_error(sid, "player_action_failed", data.get('room_id') if data else None, "An error occurred during player action")
+                if await self._update_room_and_broadcast(room_id, room, prev_state) is not None:
+                    return
+
+            raise ValueError(f"Room {room_id} kept changing; action not applied")
+
+    def _room_lock(self, room_id: str) -> asyncio.Lock:
+        """
+        The lock for `room_id`'s read-modify-write cycles, created on first use.
+        Joins and leaves hold it too while they write and notify, so `_supersede_broadcast` sees writes in order.
+        """
+        lock = self._room_locks.get(room_id)
+        if lock is None:
+            lock = self._room_locks[room_id] = asyncio.Lock()
+        return lock
+
+    def _over_action_limit(self, sid: str) -> bool:
+        """Count a playerAction from `sid` in its current fixed window and report whether it exceeds the limit."""
+        now = time.monotonic()
+        window = self._action_windows.get(sid)
+        if window is None or now - window[0] >= self.ACTION_RATE_WINDOW_S:
+            self._action_windows[sid] = [now, 1]
+            return False
+        window[1] += 1
+        return window[1] > self.ACTION_RATE_LIMIT
 
     async def _get_validated_session(self, sid: str) -> Dict:
         session = await self.sio.get_session(sid)
@@ -298,13 +404,14 @@ class GameEventHandler:
             raise ValueError("Room not found")
         return room
 
-    def _validate_host(self, room: Room, guest_id: str) -> None:
-        if room.host_id != guest_id:
-            raise ValueError("Only the host can perform this action")
+    @staticmethod
+    def _start_status(room: Room, guest_id: str) -> int:
+        """Pack the start-game preconditions into bits: 1 = caller is host, 2 = game active, 4 = enough players."""
+        return (room.host_id == guest_id) | ((room.status == 'active') << 1) | ((len(room.players) >= 2) << 2)
 
     def _validate_player_in_room(self, room: Room, guest_id: str) -> None:
         """Validate if the player is in the room."""
-        if not any(p.guest_id == guest_id for p in room.players):
+        if guest_id not in room.guest_index:
             raise ValueError("Player not in room")
 
     async def _handle_error(self, sid: str, event: str, room_id: Optional[str], error_msg: str) -> None:
@@ -314,17 +421,151 @@ class GameEventHandler:
             'error': error_msg
         }, to=sid)
 
-    async def _update_last_activity(self, room_id: str, room: Room) -> None:
-        """Update the room's last activity timestamp."""
-        room.last_activity = datetime.now(timezone.utc)
-        await crud_room.update_room(room_id, room)
+    def _room_payload(self, room: Room) -> Any:
+        """
+        Serialize `room` as the `gameStateUpdate` payload. The result is emit-ready JSON, so compute it
+        once per event and pass the same value to every emit that sends this room state.
+        """
+        return json_fragment(RoomResponse.from_orm(room), by_alias=True)
+
+    @staticmethod
+    def _state_dict(room: Room) -> Dict[str, Any]:
+        """Dump `room` as the JSON-ready dict that `gameStateUpdate` carries, for diffing."""
+        return RoomResponse.from_orm(room).model_dump(mode='json', by_alias=True)
 
-    async def _update_room_and_broadcast(self, room_id: str, room: Room) -> Room:
-        """Update room state in DB and broadcast the updated state to all clients in the room."""
+    @staticmethod
+    def _state_changes(prev: Dict[str, Any], post: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """
+        (op, JSON Pointer path) pairs for the fields that differ between two `_state_dict` dumps. `game_state`
+        fields and per-player fields are reported individually, so a card play does not resend every hand.
+        A `game_state` list that only lost items from its end (a draw from the deck or the discard pile)
+        is reported as 'remove' ops on those indices instead of a 'replace' of the whole list.
+        """
+        changes = []
+        for key, value in post.items():
+            old = prev.get(key)
+            if old == value:
+                continue
+            if key == 'game_state' and old and value:
+                for field, v in value.items():
+                    old_v = old.get(field)
+                    if old_v == v:
+                        continue
+                    if isinstance(v, list) and isinstance(old_v, list) and len(v) < len(old_v) and old_v[:len(v)] == v:
+                        changes.extend(('remove', f'/game_state/{field}/{i}') for i in range(len(v), len(old_v)))
+                    else:
+                        changes.append(('replace', f'/game_state/{field}'))
+            elif key == 'players' and old and len(old) == len(value):
+                for i, (old_player, player) in enumerate(zip(old, value)):
+                    changes.extend(('replace', f'/players/{i}/{field}') for field, v in player.items() if old_player.get(field) != v)
+            else:
+                changes.append(('replace', f'/{key}'))
+        return changes
+
+    @staticmethod
+    def _build_patch(state: Dict[str, Any], changes: Iterable[Tuple[str, str]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        RFC 6902 ops for `changes`, replace values taken from `state`. Removes come first, highest index first, so
+        they apply to the list the client holds; a remove under a path that is also replaced is dropped, since the
+        replace carries the final value. Returns None when a replace path no longer exists (e.g. a player left
+        between coalesced actions), in which case a full state is needed.
+        """
+        replaced = sorted(path for op, path in changes if op == 'replace')
+        removed = [
+            path for op, path in changes
+            if op == 'remove' and not any(path.startswith(parent + '/') for parent in replaced)
+        ]
+        patch = [
+            {'op': 'remove', 'path': path}
+            for path in sorted(removed, key=lambda path: (path.rsplit('/', 1)[0], -int(path.rsplit('/', 1)[1])))
+        ]
+        for path in replaced:
+            value: Any = state
+            try:
+                for part in path[1:].split('/'):
+                    value = value[int(part)] if isinstance(value, list) else value[part]
+            except (IndexError, KeyError, TypeError, ValueError):
+                return None
+            patch.append({'op': 'replace', 'path': path, 'value': value})
+        return patch
+
+    async def _update_room_and_broadcast(self, room_id: str, room: Room, prev_state: Optional[Dict[str, Any]] = None) -> Optional[Room]:
+        """
+        Update room state in DB and broadcast the updated state to all clients in the room.
+        `prev_state` is the `_state_dict` of the room before the change; without it delta subscribers get the full state.
+        Returns None, without broadcasting, if the room is gone or was written by someone else since `room` was read.
+        """
         room.last_activity = datetime.now(timezone.utc)
         updated_room = await crud_room.update_room(room_id, room)
         if updated_room is None:
-            raise ValueError(f"Failed to update room {room_id}")
-        room_response = RoomResponse.from_orm(updated_room).model_dump(by_alias=True)
-        await self.sio.emit(self.EVENT_GAME_STATE_UPDATE, room_response, room=room_id)
+            return None
+        # The DB write above always happens; only the serialize-and-emit is skipped when nobody is listening.
+        if self._has_members(room_id):
+            state = changes = None
+            if prev_state is not None:
+                state = self._state_dict(updated_room)
+                changes = self._state_changes(prev_state, state)
+            self._schedule_broadcast(room_id, updated_room, state, changes)
         return updated_room
+
+    def _delta_room(self, room_id: str) -> str:
+        """Name of the Socket.IO room holding the `gameStateDelta` subscribers of `room_id`."""
+        return room_id + self.DELTA_ROOM_SUFFIX
+
+    def _members(self, room_id: str) -> Any:
+        """Sids currently in the Socket.IO room `room_id` (default namespace); empty if there are none."""
+        return self.sio.manager.rooms.get('/', {}).get(room_id) or {}
+
+    def _has_members(self, room_id: str) -> bool:
+        """Whether any socket is currently in the Socket.IO room `room_id` (default namespace)."""
+        return bool(self._members(room_id))
+
+    def _schedule_broadcast(self, room_id: str, room: Room, state: Optional[Dict[str, Any]], changes: Optional[List[Tuple[str, str]]]) -> None:
+        """
+        Queue a broadcast of `room` to `room_id`. When several updates land within `BROADCAST_COALESCE_S`
+        only the latest state is sent, and delta subscribers get the union of the changes.
+        A None `changes` (no diff available) makes the coalesced broadcast a full state for everyone.
+        """
+        pending = self._pending_broadcasts.get(room_id)
+        if pending is None:
+            self._pending_broadcasts[room_id] = [room, state, None if changes is None else set(changes)]
+            task = asyncio.create_task(self._flush_broadcast(room_id))
+            self._broadcast_tasks.add(task)
+            task.add_done_callback(self._broadcast_tasks.discard)
+            return
+        merged = None if changes is None or pending[2] is None else pending[2].union(changes)
+        pending[:] = [room, state if merged is not None else None, merged]
+
+    def _supersede_broadcast(self, room_id: str, room: Room) -> None:
+        """
+        Replace a queued broadcast for `room_id` with `room`, sent in full.
+        Joins and leaves only tell the other clients who came or went, so without this the queued, older
+        state would follow them and undo the change.
+        """
+        pending = self._pending_broadcasts.get(room_id)
+        if pending is not None:
+            pending[:] = [room, None, None]
+
+    async def _flush_broadcast(self, room_id: str) -> None:
+        """
+        Send the latest queued state for `room_id` once the coalescing window has passed.
+        A state no newer than one already sent to the room (e.g. by a REST endpoint) is dropped.
+        """
+        await asyncio.sleep(self.BROADCAST_COALESCE_S)
+        room, state, changes = self._pending_broadcasts.pop(room_id)
+        if not websocket_manager.claim_room_version(room_id, room.version):
+            return
+        try:
+            delta_room = self._delta_room(room_id)
+            delta_sids = list(self._members(delta_room))
+            patch = self._build_patch(state, changes) if delta_sids and changes is not None else None
+            if patch is None:
+                await self.sio.emit(self.EVENT_GAME_STATE_UPDATE, self._room_payload(room), room=room_id)
+                return
+            # Only serialize the full state if someone in the room still takes it.
+            if len(self._members(room_id)) > len(delta_sids):
+                await self.sio.emit(self.EVENT_GAME_STATE_UPDATE, self._room_payload(room), room=room_id, skip_sid=delta_sids)
+            if patch:
+                await self.sio.emit(self.EVENT_GAME_STATE_DELTA, {'room_id': room_id, 'patch': patch}, room=delta_room)
+        except Exception:
+            logger.exception("Failed to broadcast state for room %s", room_id)
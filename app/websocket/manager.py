@@ -9,8 +9,12 @@ logger = logging.getLogger(__name__)
 
 class WebSocketManager:
     """A wrapper for the Socket.IO server to manage event emissions."""
+    __slots__ = ('sio', '_room_versions')
+
     def __init__(self):
         self.sio: Optional[socketio.AsyncServer] = None
+        # room_id -> `version` of the newest full room state sent to that room's clients by this process.
+        self._room_versions: Dict[str, int] = {}
 
     def set_sio(self, sio: socketio.AsyncServer):
         """Sets the Socket.IO server instance."""
@@ -23,9 +27,28 @@ class WebSocketManager:
             return
         try:
             await self.sio.emit(event, data, room=room, skip_sid=skip_sid)
-            logger.info(f"Emitted '{event}' to room '{room}' (skip_sid: {skip_sid})")
+            logger.debug("Emitted '%s' to room '%s' (skip_sid: %s)", event, room, skip_sid)
         except Exception as e:
-            logger.error(f"Failed to emit '{event}' to room '{room}': {e}", exc_info=True)
+            logger.error("Failed to emit '%s' to room '%s': %s", event, room, e, exc_info=True)
+
+    async def emit_room_state(self, room_id: str, version: int, data: Any, room: Optional[str] = None):
+        """Emits a room's full state as `gameStateUpdate`, unless the same or a newer version of it was already sent."""
+        if self.claim_room_version(room_id, version):
+            await self.emit('gameStateUpdate', data, room=room)
+
+    def claim_room_version(self, room_id: str, version: int) -> bool:
+        """
+        Records that `version` of `room_id`'s state is about to be sent to all of its clients.
+        Returns False, recording nothing, if the same or a newer version already was; that state must not be sent.
+        """
+        if version <= self._room_versions.get(room_id, -1):
+            return False
+        self._room_versions[room_id] = version
+        return True
+
+    def forget_room(self, room_id: str):
+        """Drops the version bookkeeping of a room that no longer has clients or no longer exists."""
+        self._room_versions.pop(room_id, None)
 
 # Create a singleton instance of the manager
 websocket_manager = WebSocketManager()
\ No newline at end of file
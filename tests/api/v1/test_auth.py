@@ -1,65 +1,56 @@
 import pytest
-import httpx
-from httpx import ASGITransport # <--- Added import
 from jose import jwt
 
-# Import your FastAPI app instance, settings, and relevant models
-from app.main import app
+# Import settings and relevant models; the app is served through the `client` fixture in conftest.py
 from app.core.config import settings
 from app.models.token import Token # To validate response structure
 
-# pytest-asyncio is usually handled automatically by modern pytest if it detects async tests.
-# If you encounter issues, you might need to explicitly enable it (e.g. in pytest.ini or conftest.py)
+# Every test shares the session-scoped `client` fixture, so they all run on the session event loop.
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-@pytest.mark.asyncio
-async def test_guest_login_with_nickname():
+async def test_guest_login_with_nickname(client):
     """
     Test guest login endpoint with a nickname.
     Ensures a 200 OK response and correct token structure.
     """
-    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client: # <--- Changed here
-        response = await client.post(
-            f"{settings.API_V1_STR}/guest/login",
-            json={"guest_request": {"nickname": "TestGuest123"}}
-        )
+    response = await client.post(
+        f"{settings.API_V1_STR}/guest/login",
+        json={"guest_request": {"nickname": "TestGuest123"}}
+    )
     assert response.status_code == 200
     token_response_data = response.json()
     
     # Validate the response structure using the Token model
     # This will raise a Pydantic ValidationError if the structure is incorrect
-    Token(**token_response_data) 
+    Token.model_validate(token_response_data) 
     
     assert "access_token" in token_response_data
     assert token_response_data["token_type"] == "bearer"
 
-@pytest.mark.asyncio
-async def test_guest_login_without_nickname():
+async def test_guest_login_without_nickname(client):
     """
     Test guest login endpoint without providing a nickname.
     Ensures a 200 OK response and correct token structure.
     """
-    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client: # <--- Changed here
-        response = await client.post(
-            f"{settings.API_V1_STR}/guest/login",
-            json={"guest_request": {}} # Sending an empty guest_request object
-        )
+    response = await client.post(
+        f"{settings.API_V1_STR}/guest/login",
+        json={"guest_request": {}} # Sending an empty guest_request object
+    )
     assert response.status_code == 200
     token_response_data = response.json()
-    Token(**token_response_data)
+    Token.model_validate(token_response_data)
     assert "access_token" in token_response_data
     assert token_response_data["token_type"] == "bearer"
 
-@pytest.mark.asyncio
-async def test_guest_login_token_payload_with_nickname():
+async def test_guest_login_token_payload_with_nickname(client):
     """
     Test that the generated JWT contains the correct payload when a nickname is provided.
     """
     test_nickname = "PayloadTester"
-    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client: # <--- Changed here
-        response = await client.post(
-            f"{settings.API_V1_STR}/guest/login",
-            json={"guest_request": {"nickname": test_nickname}}
-        )
+    response = await client.post(
+        f"{settings.API_V1_STR}/guest/login",
+        json={"guest_request": {"nickname": test_nickname}}
+    )
     assert response.status_code == 200
     token_response_data = response.json()
     access_token = token_response_data["access_token"]
@@ -82,27 +73,21 @@ async def test_guest_login_token_payload_with_nickname():
     assert "exp" in payload # Expiration time claim
     assert "iat" in payload # Issued at time claim
 
-@pytest.mark.asyncio
-async def test_guest_login_token_payload_without_nickname():
+async def test_guest_login_token_payload_without_nickname(client):
     """
     Test that the generated JWT contains the correct payload when no nickname is provided.
     The 'nickname' claim should be absent or None.
     """
-    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client: # <--- Changed here
-        response = await client.post(
-            f"{settings.API_V1_STR}/guest/login",
-            json={"guest_request": {}}
-        )
+    response = await client.post(
+        f"{settings.API_V1_STR}/guest/login",
+        json={"guest_request": {}}
+    )
     assert response.status_code == 200
     token_response_data = response.json()
     access_token = token_response_data["access_token"]
     
-    payload = jwt.decode(
-        access_token, 
-        settings.SECRET_KEY, 
-        algorithms=[settings.ALGORITHM],
-        options={"verify_aud": False}
-    )
+    # Only the claims matter here; signature verification is covered by the test above.
+    payload = jwt.get_unverified_claims(access_token)
     
     assert "sub" in payload
     assert payload["sub"] is not None
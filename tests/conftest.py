@@ -0,0 +1,17 @@
+import httpx
+import pytest_asyncio
+from httpx import ASGITransport
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """
+    A single in-process HTTP client for the whole test session, so the ASGI transport and
+    connection pool are set up once instead of per test.
+    The app is imported here rather than at module level, so tests that never touch the app
+    do not need its settings (SECRET_KEY, MONGO_URI, ...) in the environment.
+    """
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
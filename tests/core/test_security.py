@@ -0,0 +1,60 @@
+import pytest
+
+from app.core import security
+from app.core.security import create_access_token, decode_access_token
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable wall clock for the token cache, plus a count of real signature verifications."""
+    now = [1_000.0]
+    verified = []
+    real_decode = security.jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        verified.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(security.time, "time", lambda: now[0])
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    monkeypatch.setattr(security, "_verified_tokens", {})
+    return now, verified
+
+async def test_cached_token_is_reverified_after_ttl(clock):
+    now, verified = clock
+    token = create_access_token({"sub": "g1", "nickname": "n"})
+
+    assert (await decode_access_token(token)).sub == "g1"
+    now[0] += security.TOKEN_CACHE_TTL_S - 1
+    await decode_access_token(token)
+    assert len(verified) == 1
+
+    now[0] += 1
+    await decode_access_token(token)
+    assert len(verified) == 2
+
+async def test_cache_entry_never_outlives_token_exp(clock):
+    now, verified = clock
+    token = create_access_token({"sub": "g1"})
+    exp = security.jwt.get_unverified_claims(token)["exp"]
+    now[0] = exp - 5
+
+    await decode_access_token(token)
+    now[0] = exp
+    await decode_access_token(token)
+    assert len(verified) == 2
+
+async def test_oldest_entry_is_evicted_at_max_size(clock, monkeypatch):
+    _, verified = clock
+    monkeypatch.setattr(security, "TOKEN_CACHE_MAX_SIZE", 2)
+    first, second, third = (create_access_token({"sub": f"g{i}"}) for i in range(3))
+
+    for token in (first, second, third):
+        await decode_access_token(token)
+    assert len(security._verified_tokens) == 2
+
+    await decode_access_token(third)
+    assert len(verified) == 3
+    await decode_access_token(first)
+    assert len(verified) == 4
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.crud import crud_room
+from app.models.room import PlayerInRoom, Room
+
+pytestmark = pytest.mark.asyncio
+
+def make_room(version=0):
+    return Room(_id="R1", host_id="g0", players=[PlayerInRoom(guest_id="g0")], version=version)
+
+@pytest.fixture
+def collection(monkeypatch):
+    """A mocked rooms collection whose `update_one` reports one matched document unless told otherwise."""
+    collection = SimpleNamespace(update_one=AsyncMock(return_value=SimpleNamespace(matched_count=1)))
+
+    async def get_room_collection():
+        return collection
+
+    monkeypatch.setattr(crud_room, "get_room_collection", get_room_collection)
+    return collection
+
+async def test_version_match_treats_missing_version_as_zero():
+    # Rooms written before versioning have no `version`; a null query value also matches a missing field.
+    assert crud_room._version_match(0) == {"$in": [0, None]}
+    assert crud_room._version_match(3) == 3
+
+async def test_update_room_writes_over_the_version_it_read(collection):
+    room = make_room(version=3)
+
+    assert await crud_room.update_room("R1", room) is room
+    query, update = collection.update_one.await_args.args
+    assert query == {"_id": "R1", "version": 3}
+    assert update["$set"]["version"] == 4
+    assert room.version == 4
+
+async def test_update_room_returns_none_on_conflict(collection):
+    collection.update_one.return_value = SimpleNamespace(matched_count=0)
+    room = make_room(version=3)
+
+    assert await crud_room.update_room("R1", room) is None
+    assert room.version == 3
@@ -0,0 +1,38 @@
+import pytest
+
+from app.domain import game_logic
+from app.models.room import CARDS_BY_KEY, CardGameSpecificState, PlayerInRoom, Room
+
+CARDS_BY_ID = {card.id: card for card in CARDS_BY_KEY.values()}
+
+def make_room(*hands):
+    """A room with one player per hand, `g0`, `g1`, ..., holding the given card ids."""
+    players = [
+        PlayerInRoom(guest_id=f"g{i}", nickname=f"n{i}", hand=[CARDS_BY_ID[card_id] for card_id in hand])
+        for i, hand in enumerate(hands)
+    ]
+    return Room(_id="R1", host_id="g0", players=players, status="active", game_state=CardGameSpecificState(status="active"))
+
+def hand_ids(room, player_index):
+    return [card.id for card in room.players[player_index].hand]
+
+def test_move_cards_to_other_player():
+    room = make_room(["H2-0", "H3-0", "H4-0"], ["S5-0"])
+    game_logic.move_cards_to_player(room, 0, [CARDS_BY_ID["H2-0"]], "g1")
+    assert hand_ids(room, 0) == ["H3-0", "H4-0"]
+    assert hand_ids(room, 1) == ["S5-0", "H2-0"]
+
+def test_move_cards_to_self_is_refused():
+    room = make_room(["H2-0", "H3-0", "H4-0"])
+    with pytest.raises(AssertionError):
+        game_logic.move_cards_to_player(room, 0, [CARDS_BY_ID["H2-0"]], "g0")
+    assert hand_ids(room, 0) == ["H2-0", "H3-0", "H4-0"]
+
+def test_deal_cards_round_robin_from_top():
+    room = make_room([], [])
+    room.game_state.deck = [CARDS_BY_ID[card_id].key() for card_id in ("H2-0", "H3-0", "H4-0", "H5-0", "H6-0")]
+    game_logic.deal_cards(room, 2)
+    # The top of the deck is the end of the list, dealt first to the first player.
+    assert hand_ids(room, 0) == ["H6-0", "H4-0"]
+    assert hand_ids(room, 1) == ["H5-0", "H3-0"]
+    assert room.game_state.deck == [CARDS_BY_ID["H2-0"].key()]
@@ -0,0 +1,37 @@
+import pytest
+from pydantic import ValidationError
+
+from app.domain.deck import shuffled_keys
+from app.models.room import CARDS_BY_KEY, CardGameSpecificState, PlayerInRoom, Room
+
+def make_room(num_decks, include_jokers):
+    """An active room whose deck is a fresh shuffle and whose player holds the deck's top card."""
+    deck = shuffled_keys(num_decks, include_jokers)
+    top = CARDS_BY_KEY[deck.pop()]
+    players = [PlayerInRoom(guest_id="g0", hand=[top])]
+    return Room(_id="R1", host_id="g0", players=players, status="active", game_state=CardGameSpecificState(status="active", deck=deck))
+
+@pytest.mark.parametrize("num_decks", [1, 3])
+@pytest.mark.parametrize("include_jokers", [False, True])
+def test_room_round_trips_through_dump(num_decks, include_jokers):
+    room = make_room(num_decks, include_jokers)
+    dumped = room.model_dump(by_alias=True)
+    # The deck is stored as card dicts, the same shape as hands and piles.
+    assert dumped["game_state"]["deck"][0].keys() == {"id", "suit", "rank", "deckId"}
+
+    restored = Room(**dumped)
+    assert restored.game_state.deck == room.game_state.deck
+    assert len(restored.game_state.deck) == num_decks * (54 if include_jokers else 52) - 1
+    # Known cards resolve to the shared instances rather than new Card objects.
+    assert restored.players[0].hand[0] is room.players[0].hand[0]
+
+@pytest.mark.parametrize("bad_card", [
+    {"id": "X9-0", "suit": "X", "rank": "9", "deckId": 0},
+    {"id": "H2-0", "suit": "H", "deckId": 0},
+    {"id": "H2-9", "suit": "H", "rank": "2", "deckId": 9},
+])
+def test_malformed_stored_deck_card_is_a_validation_error(bad_card):
+    dumped = make_room(1, False).model_dump(by_alias=True)
+    dumped["game_state"]["deck"].append(bad_card)
+    with pytest.raises(ValidationError):
+        Room(**dumped)
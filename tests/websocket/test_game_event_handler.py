@@ -0,0 +1,158 @@
+import copy
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.crud import crud_room
+
+from app.domain.deck import shuffled_keys
+from app.models.room import CardGameSpecificState, PlayerInRoom, Room
+from app.websocket.game_event_handler import GameEventHandler
+
+state_dict = GameEventHandler._state_dict
+state_changes = GameEventHandler._state_changes
+build_patch = GameEventHandler._build_patch
+
+# Rooms stamp their timestamps at creation; pin them so only the fields under test differ.
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def make_room(game_state=None, guest_ids=("g0", "g1"), status="waiting"):
+    players = [PlayerInRoom(guest_id=guest_id, nickname=guest_id) for guest_id in guest_ids]
+    return Room(
+        _id="R1", host_id=guest_ids[0], players=players, game_state=game_state, status=status,
+        created_at=NOW, updated_at=NOW, last_activity=NOW,
+    )
+
+def apply_patch(doc, patch):
+    """Applies the remove/replace ops `gameStateDelta` uses, as a client would."""
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        *parents, last = op["path"][1:].split("/")
+        target = doc
+        for part in parents:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        key = int(last) if isinstance(target, list) else last
+        if op["op"] == "remove":
+            del target[key]
+        else:
+            target[key] = op["value"]
+    return doc
+
+def diff_patch(prev_room, post_room):
+    prev, post = state_dict(prev_room), state_dict(post_room)
+    patch = build_patch(post, state_changes(prev, post))
+    assert apply_patch(prev, patch) == post
+    return patch
+
+def test_game_state_appearing_and_disappearing_is_replaced_whole():
+    started = make_room(CardGameSpecificState(status="active", deck=shuffled_keys()))
+    assert [op["path"] for op in diff_patch(make_room(), started)] == ["/game_state"]
+    assert [op["path"] for op in diff_patch(started, make_room())] == ["/game_state"]
+
+def test_player_swapped_at_same_index():
+    patch = diff_patch(make_room(guest_ids=("g0", "g1")), make_room(guest_ids=("g0", "g2")))
+    assert {op["path"] for op in patch} == {"/players/1/guest_id", "/players/1/nickname"}
+
+def test_draw_removes_only_the_drawn_deck_cards():
+    deck = shuffled_keys()
+    prev = make_room(CardGameSpecificState(status="active", deck=deck))
+    post = make_room(CardGameSpecificState(status="active", deck=deck[:-2]))
+    assert diff_patch(prev, post) == [
+        {"op": "remove", "path": "/game_state/deck/51"},
+        {"op": "remove", "path": "/game_state/deck/50"},
+    ]
+
+def test_reshuffled_deck_is_replaced_whole():
+    deck = shuffled_keys()
+    prev = make_room(CardGameSpecificState(status="active", deck=deck))
+    post = make_room(CardGameSpecificState(status="active", deck=deck[::-1]))
+    assert [op["path"] for op in diff_patch(prev, post)] == ["/game_state/deck"]
+
+def test_coalesced_draw_then_reshuffle_drops_the_removes():
+    deck = shuffled_keys()
+    base = state_dict(make_room(CardGameSpecificState(status="active", deck=deck)))
+    drawn = state_dict(make_room(CardGameSpecificState(status="active", deck=deck[:-1])))
+    final = state_dict(make_room(CardGameSpecificState(status="active", deck=deck[-2::-1])))
+    changes = set(state_changes(base, drawn)) | set(state_changes(drawn, final))
+    patch = build_patch(final, changes)
+    assert [op["op"] for op in patch] == ["replace"]
+    assert apply_patch(base, patch) == final
+
+def test_patch_needs_full_state_when_a_path_is_gone():
+    state = state_dict(make_room())
+    assert build_patch(state, {("replace", "/players/5/hand")}) is None
+
+def test_action_rate_limit_window_and_reset(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.websocket.game_event_handler.time.monotonic", lambda: clock[0])
+    handler = GameEventHandler(sio=None)
+    limit = GameEventHandler.ACTION_RATE_LIMIT
+
+    assert not any(handler._over_action_limit("s1") for _ in range(limit))
+    assert handler._over_action_limit("s1")
+    # Budgets are per connection.
+    assert not handler._over_action_limit("s2")
+
+    clock[0] += GameEventHandler.ACTION_RATE_WINDOW_S - 0.01
+    assert handler._over_action_limit("s1")
+    clock[0] += 0.01
+    assert not handler._over_action_limit("s1")
+
+def make_handler():
+    """A handler over a fake server with a g0 session and no sockets in any room."""
+    sio = SimpleNamespace(
+        get_session=AsyncMock(return_value={"guest_id": "g0"}),
+        emit=AsyncMock(),
+        manager=SimpleNamespace(rooms={}),
+    )
+    return GameEventHandler(sio=sio)
+
+def patch_room_store(monkeypatch, reads, write_results):
+    """Serve each `get_room_by_id` from a fresh copy of the next of `reads`; `update_room` answers from `write_results`."""
+    reads = iter(reads)
+    results = iter(write_results)
+    written = []
+
+    async def get_room_by_id(room_id):
+        return next(reads).model_copy(deep=True)
+
+    async def update_room(room_id, room):
+        written.append(room)
+        return room if next(results) else None
+
+    monkeypatch.setattr(crud_room, "get_room_by_id", get_room_by_id)
+    monkeypatch.setattr(crud_room, "update_room", update_room)
+    return written
+
+DRAW = {"room_id": "R1", "action_type": "DRAW_CARD"}
+
+@pytest.mark.asyncio
+async def test_action_is_reapplied_to_a_fresh_read_after_a_conflict(monkeypatch):
+    deck = shuffled_keys()
+    first = make_room(CardGameSpecificState(status="active", deck=deck), status="active")
+    # Someone else drew between our read and our write.
+    second = make_room(CardGameSpecificState(status="active", deck=deck[:-1]), status="active")
+    written = patch_room_store(monkeypatch, [first, second], [False, True])
+    handler = make_handler()
+
+    await handler.handle_player_action("s1", DRAW)
+
+    assert len(written) == 2
+    assert written[1].game_state.deck == deck[:-2]
+    assert len(written[1].players[0].hand) == 1
+    handler.sio.emit.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_action_gives_up_after_repeated_conflicts(monkeypatch):
+    room = make_room(CardGameSpecificState(status="active", deck=shuffled_keys()), status="active")
+    attempts = GameEventHandler.ACTION_WRITE_ATTEMPTS
+    written = patch_room_store(monkeypatch, [room] * attempts, [False] * attempts)
+    handler = make_handler()
+
+    await handler.handle_player_action("s1", DRAW)
+
+    assert len(written) == attempts
+    event = handler.sio.emit.await_args.args[0]
+    assert event == "player_action_failed"
@@ -0,0 +1,34 @@
+import pytest
+
+from app.models.room import CARDS_BY_KEY, CardGameSpecificState, PlayerInRoom, Room
+from app.websocket.actions.base import UNCHANGED
+from app.websocket.actions.player_actions import MoveCardsToPlayerAction, UpdateHandOrderAction
+
+CARDS_BY_ID = {card.id: card for card in CARDS_BY_KEY.values()}
+
+def make_room(*hands):
+    """An active room with one player per hand, `g0`, `g1`, ..., holding the given card ids."""
+    players = [
+        PlayerInRoom(guest_id=f"g{i}", nickname=f"n{i}", hand=[CARDS_BY_ID[card_id] for card_id in hand])
+        for i, hand in enumerate(hands)
+    ]
+    return Room(_id="R1", host_id="g0", players=players, status="active", game_state=CardGameSpecificState(status="active"))
+
+def test_move_cards_to_self_is_rejected():
+    room = make_room(["H2-0", "H3-0"], [])
+    action = MoveCardsToPlayerAction(cards=[CARDS_BY_ID["H2-0"]], targetPlayerId="g0")
+    with pytest.raises(ValueError):
+        action.validate_action(0, room.game_state, room)
+
+def test_update_hand_order_in_same_order_is_unchanged():
+    room = make_room(["H2-0", "H3-0"])
+    action = UpdateHandOrderAction(cards=[CARDS_BY_ID["H2-0"], CARDS_BY_ID["H3-0"]])
+    action.validate_action(0, room.game_state, room)
+    assert action.apply(room.game_state, 0, room) is UNCHANGED
+
+def test_update_hand_order_replaces_hand():
+    room = make_room(["H2-0", "H3-0", "H4-0"])
+    action = UpdateHandOrderAction(cards=[CARDS_BY_ID["H4-0"], CARDS_BY_ID["H2-0"]])
+    action.validate_action(0, room.game_state, room)
+    assert action.apply(room.game_state, 0, room) is not UNCHANGED
+    assert [card.id for card in room.players[0].hand] == ["H4-0", "H2-0"]